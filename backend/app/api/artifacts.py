@@ -1,35 +1,238 @@
 """Artifacts API - Endpoints for downloading generated documents."""
 
 import asyncio
-import base64
-import json
+import functools
+import gzip
+import hashlib
 import logging
-from typing import Literal, AsyncGenerator
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Literal, AsyncGenerator, Awaitable, Callable
 from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
-from sse_starlette.sse import EventSourceResponse
-
-from app.schemas.slidespec import SlideSpec, Slide
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import ValidationError
+
+from app.cache import LRUCache
+from app.config import get_settings
+from app.schemas.slidespec import (
+    SlideSpec,
+    Slide,
+    Element,
+    DeckStyle,
+)
+from app.api.sse import sse_frame, sse_response
+from app.api.deps import agent_dep, export_dep, slidespec_dep, storage_dep
+from app.services.agent_service import AgentService
 from app.services.export_service import ExportService
-from app.services.storage_service import get_storage_service
-from app.renderers.html_slide_renderer import HTMLSlideRenderer
+from app.services.html_capture_service import get_html_capture_service
+from app.services.storage_service import StorageService
+from app.renderers.html_slide_renderer import get_html_slide_renderer
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed file downloads
+DOWNLOAD_CHUNK_SIZE = 100 * 1024
+
+# Characters replaced in the ASCII fallback filename / dropped from titles
+_ASCII_DISALLOWED = re.compile(r"[^A-Za-z0-9 _\-]")
+_KEEP_RE = re.compile(r"[^\w \-]")
+
+# Exports handed out by export-stream: token -> (artifact_id, path, filename, expires_at)
+DOWNLOAD_TOKEN_TTL = 300
+_download_tokens: LRUCache[str, tuple[str, Path, str, float]] = LRUCache(maxsize=256)
+
+# Rendered PPTX/DOCX exports, named {artifact_id}-{version}.{format}
+_default_export_cache_dir = Path(tempfile.gettempdir()) / "docai_exports"
+
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Stateless services shared by every handler
+_renderer = get_html_slide_renderer()
+
+# Parsed SlideSpec per artifact, tagged with the storage version it was built from
+_parsed_cache: LRUCache[str, tuple[int, SlideSpec]] = LRUCache(maxsize=128)
+
+# UTF-8 encoded deck HTML keyed by (artifact_id, version)
+_deck_html_cache: LRUCache[tuple[str, int], bytes] = LRUCache(maxsize=64)
+
+# Rendered slide HTML keyed by a content hash (see _slide_render_key), so
+# unchanged slides stay cached across edits to their siblings
+_slide_html_cache: LRUCache[bytes, str] = LRUCache(maxsize=1024)
+
+# Renderer deck context (resolved deck style) keyed by (artifact_id, version)
+_deck_context_cache: LRUCache[tuple[str, int], dict] = LRUCache(maxsize=128)
+
+# Gzipped deck HTML keyed by (artifact_id, version)
+_gzip_html_cache: LRUCache[tuple[str, int], bytes] = LRUCache(maxsize=64)
 
-def _get_storage():
-    """Get storage service instance."""
-    return get_storage_service()
+# Serialized JSON bodies of read-only GETs, keyed by (route, key, storage version)
+# so that any write to the artifact (or catalog) misses the old entries
+_response_cache: LRUCache[tuple[str, str, int], bytes] = LRUCache(maxsize=256)
 
 
+def _get_parsed(storage: StorageService, artifact_id: str, slidespec_dict: dict) -> SlideSpec:
+    """Get the parsed SlideSpec for an artifact, rebuilding it only after a write."""
+    version = storage.get_slidespec_version(artifact_id)
+    cached = _parsed_cache.get(artifact_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    slidespec = SlideSpec.fast_rehydrate(slidespec_dict)
+    _parsed_cache.set(artifact_id, (version, slidespec))
+    return slidespec
+
+
+def _get_deck_context(storage: StorageService, artifact_id: str, slidespec_dict: dict) -> dict:
+    """Get the renderer's deck context for an artifact, rebuilding it only after a write."""
+    key = (artifact_id, storage.get_slidespec_version(artifact_id))
+    deck_context = _deck_context_cache.get(key)
+    if deck_context is None:
+        style = slidespec_dict.get("style")
+        deck_style = DeckStyle.model_construct(**style) if style is not None else None
+        deck_context = _renderer.prepare_deck_context(deck_style)
+        _deck_context_cache.set(key, deck_context)
+    return deck_context
+
+
+def _slide_render_key(slide_dict: dict, slide_index: int, deck_style: dict | None) -> bytes:
+    """Hash everything that affects a slide's rendered HTML."""
+    payload = orjson.dumps([slide_index, deck_style, slide_dict], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+async def _render_slide(
+    storage: StorageService,
+    artifact_id: str,
+    slidespec_dict: dict,
+    slide_index: int,
+    slide_dict: dict | None = None,
+    slide: Slide | None = None,
+) -> str:
+    """Render one slide of an artifact, reusing cached HTML for identical content.
+
+    slide_dict defaults to the stored slide; pass slide when an already
+    built model is at hand to skip rebuilding it on a cache miss.
+    """
+    if slide_dict is None:
+        slide_dict = slidespec_dict["slides"][slide_index]
+    key = _slide_render_key(slide_dict, slide_index, slidespec_dict.get("style"))
+    html = _slide_html_cache.get(key)
+    if html is None:
+        if slide is None:
+            slide = Slide.fast_rehydrate(slide_dict)
+        deck_context = _get_deck_context(storage, artifact_id, slidespec_dict)
+        html = await asyncio.to_thread(
+            _renderer.render_slide, slide, slide_index, deck_context=deck_context
+        )
+        _slide_html_cache.set(key, html)
+    return html
+
+
+async def _render_deck_html(storage: StorageService, artifact_id: str, slidespec_dict: dict) -> bytes:
+    """Get the UTF-8 encoded deck HTML for an artifact, rendering only on a cache miss."""
+    key = (artifact_id, storage.get_slidespec_version(artifact_id))
+    html_bytes = _deck_html_cache.get(key)
+    if html_bytes is None:
+        slidespec = _get_parsed(storage, artifact_id, slidespec_dict)
+        # Slides missing from the HTML cache render concurrently on worker threads
+        slides_html = await asyncio.gather(*(
+            _render_slide(storage, artifact_id, slidespec_dict, idx, slide_dict, slide)
+            for idx, (slide_dict, slide) in enumerate(zip(slidespec_dict["slides"], slidespec.slides))
+        ))
+        html = await asyncio.to_thread(_renderer.render_deck, slidespec, slides_html)
+        html_bytes = html.encode("utf-8")
+        _deck_html_cache.set(key, html_bytes)
+    return html_bytes
+
+
+def _cached_json(route: str, key: str, version: int, build: Callable[[], Any]) -> Response:
+    """Return a JSON response, reusing the serialized body while the version holds."""
+    cache_key = (route, key, version)
+    body = _response_cache.get(cache_key)
+    if body is None:
+        body = orjson.dumps(build())
+        _response_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _etag_headers(etag: str) -> dict[str, str]:
+    """Headers making clients revalidate a cached response by ETag."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if the request's If-None-Match covers etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=_etag_headers(etag))
+    return None
+
+
+def _merge_patch(base: dict, patch: dict) -> dict:
+    """Deep-merge a patch into a copy of base; nested dicts merge, other values replace."""
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_patch(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+async def _deck_html_response(
+    storage: StorageService,
+    artifact_id: str,
+    slidespec_dict: dict,
+    request: Request,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Build a deck HTML response, gzipped (and cached) when the client accepts it."""
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    # Each encoding is a distinct representation, so it gets its own ETag
+    etag = f'"{storage.get_slidespec_etag(artifact_id)}-deck{"-gz" if use_gzip else ""}"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
+    html_bytes = await _render_deck_html(storage, artifact_id, slidespec_dict)
+    headers = {**(headers or {}), **_etag_headers(etag), "Vary": "Accept-Encoding"}
+
+    if use_gzip:
+        key = (artifact_id, storage.get_slidespec_version(artifact_id))
+        compressed = _gzip_html_cache.get(key)
+        if compressed is None:
+            compressed = await asyncio.to_thread(gzip.compress, html_bytes, 6)
+            _gzip_html_cache.set(key, compressed)
+        html_bytes = compressed
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=html_bytes, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_filename(title: str) -> str:
+    """Turn a deck title into a download filename (without extension)."""
+    # Keep alphanumeric (including Korean), spaces, hyphens, underscores
+    return _KEEP_RE.sub("", title).strip()[:50] or "presentation"
+
+
+@functools.lru_cache(maxsize=1024)
 def make_content_disposition(filename: str, extension: str) -> str:
     """Create Content-Disposition header with proper encoding for non-ASCII filenames."""
     # ASCII fallback filename
-    ascii_filename = "".join(c if c.isascii() and c.isalnum() or c in (' ', '-', '_') else '_' for c in filename)
-    ascii_filename = ascii_filename.strip() or "presentation"
+    ascii_filename = _ASCII_DISALLOWED.sub("_", filename).strip() or "presentation"
 
     # UTF-8 encoded filename (RFC 5987)
     utf8_filename = quote(filename, safe='')
@@ -37,50 +240,141 @@ def make_content_disposition(filename: str, extension: str) -> str:
     return f"attachment; filename=\"{ascii_filename}.{extension}\"; filename*=UTF-8''{utf8_filename}.{extension}"
 
 
+def _export_cache_dir() -> Path:
+    """Directory holding rendered exports (served by nginx when X-Accel is enabled)."""
+    settings = get_settings()
+    if settings.use_xaccel:
+        return Path(settings.xaccel_export_dir)
+    return _default_export_cache_dir
+
+
+async def _create_export(path: Path, write: Callable[[Path], Awaitable[None]]) -> None:
+    """Atomically create an export file at its cache path; write() fills a temp file beside it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        await write(Path(tmp_path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _issue_download_token(artifact_id: str, path: Path, filename: str) -> str:
+    """Register a short-lived, single-use token for downloading a cached export."""
+    token = secrets.token_urlsafe(16)
+    expires_at = time.monotonic() + DOWNLOAD_TOKEN_TTL
+    _download_tokens.set(token, (artifact_id, path, filename, expires_at))
+    return token
+
+
+def _touch_export_file(path: Path) -> bool:
+    """Refresh a cached export's mtime so the sweeper keeps it; False if missing."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _sweep_export_cache(max_age: float) -> int:
+    """Delete cached exports not downloaded within max_age seconds."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = os.scandir(_export_cache_dir())
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
+
+
+async def sweep_export_cache_periodically() -> None:
+    """Background task evicting stale exports from the disk cache."""
+    max_age = get_settings().export_cache_max_age
+    while True:
+        await asyncio.sleep(max(max_age / 4, 60))
+        try:
+            removed = await asyncio.to_thread(_sweep_export_cache, max_age)
+            if removed:
+                logger.info(f"Swept {removed} cached exports")
+        except OSError as e:
+            logger.error(f"Failed to sweep export cache: {e}")
+
+
+def _serve_export(path: Path, media_type: str, filename: str, extension: str) -> Response:
+    """Serve a cached export file, delegating the transfer to the proxy when X-Accel is enabled."""
+    content_disposition = make_content_disposition(filename, extension)
+    settings = get_settings()
+    if settings.use_xaccel:
+        return Response(
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": f"{settings.xaccel_internal_prefix.rstrip('/')}/{path.name}",
+                "Content-Disposition": content_disposition,
+            },
+        )
+
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        headers={"Content-Disposition": content_disposition},
+    )
+    response.chunk_size = DOWNLOAD_CHUNK_SIZE
+    return response
+
+
 @router.get("/artifacts")
 async def list_artifacts(
     limit: int = Query(default=20, le=100),
     offset: int = Query(default=0, ge=0),
+    storage: StorageService = Depends(storage_dep),
 ):
     """List all artifacts."""
-    storage = _get_storage()
-    items, total = storage.list_slidespecs(limit=limit, offset=offset)
 
-    return {
-        "items": items,
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-    }
+    def build():
+        items, total = storage.list_slidespecs(limit=limit, offset=offset)
+        return {
+            "items": items,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
+
+    return _cached_json("list", f"{limit}:{offset}", storage.get_catalog_version(), build)
 
 
 @router.get("/artifacts/{artifact_id}")
-async def get_artifact(artifact_id: str):
+async def get_artifact(artifact_id: str, storage: StorageService = Depends(storage_dep)):
     """Get artifact metadata."""
-    storage = _get_storage()
-    slidespec = storage.get_slidespec(artifact_id)
+    metadata = storage.get_slidespec_metadata(artifact_id)
 
-    if not slidespec:
+    if not metadata:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
-    return {
-        "artifact_id": artifact_id,
-        "title": slidespec.get("deck", {}).get("title", "Untitled"),
-        "slide_count": len(slidespec.get("slides", [])),
-        "formats": ["pptx", "docx", "html"],
-        "created_at": slidespec.get("created_at"),
-    }
+    return _cached_json(
+        "artifact", artifact_id, storage.get_slidespec_version(artifact_id),
+        lambda: {
+            "artifact_id": artifact_id,
+            "title": metadata["title"],
+            "slide_count": metadata["slide_count"],
+            "formats": ["pptx", "docx", "html"],
+            "created_at": metadata["created_at"],
+        },
+    )
 
 
-@router.delete("/artifacts/{artifact_id}")
-async def delete_artifact(artifact_id: str):
+@router.delete("/artifacts/{artifact_id}", dependencies=[Depends(slidespec_dep)])
+async def delete_artifact(artifact_id: str, storage: StorageService = Depends(storage_dep)):
     """Delete an artifact."""
-    storage = _get_storage()
-    slidespec = storage.get_slidespec(artifact_id)
-
-    if not slidespec:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
     storage.delete_slidespec(artifact_id)
 
     return {"message": "Artifact deleted", "artifact_id": artifact_id}
@@ -89,54 +383,41 @@ async def delete_artifact(artifact_id: str):
 @router.get("/artifacts/{artifact_id}/download")
 async def download_artifact(
     artifact_id: str,
+    request: Request,
     format: Literal["pptx", "docx", "html"] = Query(default="pptx"),
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+    exporter: ExportService = Depends(export_dep),
 ):
     """Download the generated artifact in specified format."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
+    slidespec = _get_parsed(storage, artifact_id, slidespec_dict)
 
-    slidespec = SlideSpec.model_validate(slidespec_dict)
+    filename = _sanitize_filename(slidespec.deck.title or "presentation")
 
-    export_service = ExportService()
-    renderer = HTMLSlideRenderer()
-
-    title = slidespec.deck.title or "presentation"
-    # Sanitize filename - keep alphanumeric (including Korean), spaces, hyphens, underscores
-    filename = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-    filename = filename[:50] or "presentation"
+    # Exports are cached on disk per storage version, so edits invalidate them
+    version = storage.get_slidespec_version(artifact_id)
+    cache_path = _export_cache_dir() / f"{artifact_id}-{version}.{format}"
 
     if format == "pptx":
         # Use image-based export for pixel-perfect rendering
-        content = await export_service.export_to_pptx_as_images(slidespec)
-        return Response(
-            content=content,
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            headers={
-                "Content-Disposition": make_content_disposition(filename, "pptx")
-            },
-        )
+        if not await asyncio.to_thread(_touch_export_file, cache_path):
+            await _create_export(
+                cache_path, lambda tmp: exporter.export_to_pptx_as_images_path(slidespec, tmp)
+            )
+        return _serve_export(cache_path, PPTX_MEDIA_TYPE, filename, "pptx")
 
     elif format == "docx":
-        content = export_service.export_to_docx(slidespec)
-        return Response(
-            content=content,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": make_content_disposition(filename, "docx")
-            },
-        )
+        if not await asyncio.to_thread(_touch_export_file, cache_path):
+            await _create_export(
+                cache_path,
+                lambda tmp: exporter.export_to_docx_path(storage.get_slidespec_bytes(artifact_id), tmp),
+            )
+        return _serve_export(cache_path, DOCX_MEDIA_TYPE, filename, "docx")
 
     elif format == "html":
-        html_content = renderer.render_deck(slidespec)
-        return Response(
-            content=html_content.encode("utf-8"),
-            media_type="text/html; charset=utf-8",
-            headers={
-                "Content-Disposition": make_content_disposition(filename, "html")
-            },
+        return await _deck_html_response(
+            storage, artifact_id, slidespec_dict, request,
+            headers={"Content-Disposition": make_content_disposition(filename, "html")},
         )
 
     else:
@@ -144,126 +425,172 @@ async def download_artifact(
 
 
 @router.get("/artifacts/{artifact_id}/preview")
-async def preview_artifact(artifact_id: str):
+async def preview_artifact(
+    artifact_id: str,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
     """Get HTML preview of the artifact."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
+    return await _deck_html_response(storage, artifact_id, slidespec_dict, request)
 
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
-    slidespec = SlideSpec.model_validate(slidespec_dict)
-
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_deck(slidespec)
-
-    return Response(
-        content=html_content.encode("utf-8"),
-        media_type="text/html; charset=utf-8",
-    )
 
-
-@router.get("/artifacts/{artifact_id}/slides")
-async def list_slides(artifact_id: str):
+@router.get("/artifacts/{artifact_id}/slides", response_class=ORJSONResponse)
+async def list_slides(
+    artifact_id: str,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
     """Get list of all slides in an artifact with summary info."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
-    slides = slidespec_dict.get("slides", [])
-    slide_list = []
-
-    for idx, slide in enumerate(slides):
-        # Extract title from elements
-        title = ""
-        for elem in slide.get("elements", []):
-            if elem.get("role") == "title" and elem.get("kind") == "text":
-                title = elem.get("content", {}).get("text", "")
-                break
-
-        slide_list.append({
-            "index": idx,
-            "slide_id": slide.get("slide_id", f"slide-{idx}"),
-            "type": slide.get("type", "content"),
-            "layout": slide.get("layout", {}).get("layout_id", "one_column"),
-            "title": title,
-        })
-
-    return {
-        "artifact_id": artifact_id,
-        "total_slides": len(slides),
-        "slides": slide_list,
-    }
-
-
-@router.get("/artifacts/{artifact_id}/slides/{slide_index}")
-async def get_slide_html(artifact_id: str, slide_index: int):
+    etag = f'"{storage.get_slidespec_etag(artifact_id)}-slides"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
+    def build():
+        # Summaries are maintained by storage on every save
+        slide_list = storage.get_slide_summaries(artifact_id)
+        return {
+            "artifact_id": artifact_id,
+            "total_slides": len(slide_list),
+            "slides": slide_list,
+        }
+
+    response = _cached_json("slides", artifact_id, storage.get_slidespec_version(artifact_id), build)
+    response.headers.update(_etag_headers(etag))
+    return response
+
+
+@router.get("/artifacts/{artifact_id}/slides/{slide_index}", response_class=ORJSONResponse)
+async def get_slide_html(
+    artifact_id: str,
+    slide_index: int,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
     """Get HTML for a specific slide."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
     slides = slidespec_dict.get("slides", [])
 
     if slide_index < 0 or slide_index >= len(slides):
         raise HTTPException(status_code=404, detail="Slide not found")
 
-    slide = Slide.model_validate(slides[slide_index])
+    etag = f'"{storage.get_slidespec_etag(artifact_id)}-{slide_index}"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
 
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_slide(slide, slide_index)
+    html_content = await _render_slide(storage, artifact_id, slidespec_dict, slide_index)
 
-    return {
+    return ORJSONResponse({
         "slide_index": slide_index,
-        "slide_id": slide.slide_id,
+        "slide_id": slides[slide_index].get("slide_id"),
         "html": html_content,
         "slide_data": slides[slide_index],
-    }
+    }, headers=_etag_headers(etag))
 
 
-@router.get("/artifacts/{artifact_id}/slidespec")
-async def get_slidespec(artifact_id: str):
+@router.get("/artifacts/{artifact_id}/slidespec", response_class=ORJSONResponse)
+async def get_slidespec(
+    artifact_id: str,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+):
     """Get the raw SlideSpec JSON."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
+    raw = storage.get_slidespec_bytes(artifact_id)
 
-    if not slidespec_dict:
+    if raw is None:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
-    return slidespec_dict
+    etag = f'"{storage.get_slidespec_etag(artifact_id)}"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
+    # Storage keeps the serialized document, so this skips encoding entirely
+    return Response(content=raw, media_type="application/json", headers=_etag_headers(etag))
 
 
 @router.put("/artifacts/{artifact_id}/slides/{slide_index}")
-async def update_slide(artifact_id: str, slide_index: int, slide_data: dict):
-    """Update a specific slide's data."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
+async def update_slide(
+    artifact_id: str,
+    slide_index: int,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
+    """Replace a specific slide's data."""
+    slides = slidespec_dict.get("slides", [])
+
+    if slide_index < 0 or slide_index >= len(slides):
+        raise HTTPException(status_code=404, detail="Slide not found")
+
+    # Validate the new slide data straight from the raw body (single pass)
+    try:
+        validated_slide = Slide.model_validate_json(await request.body())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid slide data: {str(e)}")
+
+    return await _store_slide(
+        storage, artifact_id, slidespec_dict, slide_index,
+        validated_slide.model_dump(mode="python"), validated_slide,
+    )
 
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
 
+@router.patch("/artifacts/{artifact_id}/slides/{slide_index}")
+async def patch_slide(
+    artifact_id: str,
+    slide_index: int,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
+    """Update part of a specific slide's data.
+
+    The body is deep-merged into the stored slide (nested objects merge, other
+    values replace); fields it leaves out, such as elements, keep their stored
+    values. The merged slide is validated and stored in normalized form.
+    """
     slides = slidespec_dict.get("slides", [])
 
     if slide_index < 0 or slide_index >= len(slides):
         raise HTTPException(status_code=404, detail="Slide not found")
 
-    # Validate the new slide data
     try:
-        validated_slide = Slide.model_validate(slide_data)
-        # Update the slide in storage
-        slides[slide_index] = validated_slide.model_dump()
-        # Save to persistent storage
-        storage.save_slidespec(artifact_id, slidespec_dict)
+        patch = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid slide data: {str(e)}")
+    if not isinstance(patch, dict):
+        raise HTTPException(status_code=400, detail="Invalid slide data: expected a JSON object")
+
+    try:
+        validated_slide = Slide.model_validate(_merge_patch(slides[slide_index], patch))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid slide data: {str(e)}")
 
+    # Store the normalized dump (as update_slide does): reads rebuild slides
+    # with fast_rehydrate, which trusts them to be validated data
+    return await _store_slide(
+        storage, artifact_id, slidespec_dict, slide_index,
+        validated_slide.model_dump(mode="python"), validated_slide,
+    )
+
+
+async def _store_slide(
+    storage: StorageService,
+    artifact_id: str,
+    slidespec_dict: dict,
+    slide_index: int,
+    new_slide: dict,
+    validated_slide: Slide,
+) -> dict:
+    """Store an updated slide and return its re-rendered HTML."""
+    # Update the slide in storage; persisted by the background flush
+    slidespec_dict["slides"][slide_index] = new_slide
+    storage.save_slidespec_deferred(artifact_id, slidespec_dict, changed_slide=slide_index)
+
     # Re-render the slide HTML
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_slide(validated_slide, slide_index)
+    html_content = await _render_slide(
+        storage, artifact_id, slidespec_dict, slide_index, new_slide, validated_slide
+    )
 
     return {
         "slide_index": slide_index,
@@ -274,41 +601,35 @@ async def update_slide(artifact_id: str, slide_index: int, slide_data: dict):
 
 
 @router.put("/artifacts/{artifact_id}/slides/{slide_index}/element/{element_id}")
-async def update_element(artifact_id: str, slide_index: int, element_id: str, element_data: dict):
+async def update_element(
+    artifact_id: str,
+    slide_index: int,
+    element_id: str,
+    element_data: dict,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
     """Update a specific element within a slide."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
     slides = slidespec_dict.get("slides", [])
 
     if slide_index < 0 or slide_index >= len(slides):
         raise HTTPException(status_code=404, detail="Slide not found")
 
-    slide = slides[slide_index]
-    elements = slide.get("elements", [])
-
-    # Find and update the element
-    element_found = False
-    for i, elem in enumerate(elements):
-        if elem.get("element_id") == element_id:
-            # Merge the update with existing element
-            elements[i].update(element_data)
-            element_found = True
-            break
-
-    if not element_found:
+    element = storage.get_element(artifact_id, slide_index, element_id)
+    if element is None:
         raise HTTPException(status_code=404, detail=f"Element {element_id} not found")
 
-    # Save to persistent storage
-    storage.save_slidespec(artifact_id, slidespec_dict)
+    # Validate only the touched element; its siblings were validated when stored
+    try:
+        Element.model_validate({**element, **element_data})
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid element data: {str(e)}")
+
+    # Merge in place (keeping the element index valid); persisted by the background flush
+    storage.patch_element(artifact_id, slide_index, element_id, element_data)
 
-    # Re-render the slide
-    validated_slide = Slide.model_validate(slide)
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_slide(validated_slide, slide_index)
+    # Re-render the slide straight from the in-memory dict
+    html_content = await _render_slide(storage, artifact_id, slidespec_dict, slide_index)
 
     return {
         "slide_index": slide_index,
@@ -319,28 +640,39 @@ async def update_element(artifact_id: str, slide_index: int, element_id: str, el
 
 
 @router.post("/artifacts/{artifact_id}/slides/{slide_index}/preview")
-async def preview_slide(artifact_id: str, slide_index: int, slide_data: dict):
+async def preview_slide(
+    artifact_id: str,
+    slide_index: int,
+    request: Request,
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+):
     """Preview a slide with given data without saving (for real-time editing preview)."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
     slides = slidespec_dict.get("slides", [])
 
     if slide_index < 0 or slide_index >= len(slides):
         raise HTTPException(status_code=404, detail="Slide not found")
 
-    # Validate the slide data
+    raw = await request.body()
     try:
-        validated_slide = Slide.model_validate(slide_data)
-    except Exception as e:
+        slide_dict = orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid slide data: {str(e)}")
 
-    # Render HTML without saving
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_slide(validated_slide, slide_index)
+    # Identical content was already validated and rendered; serve it as is
+    key = _slide_render_key(slide_dict, slide_index, slidespec_dict.get("style"))
+    html_content = _slide_html_cache.get(key)
+    if html_content is None:
+        # Validate the slide data straight from the raw body (single pass)
+        try:
+            validated_slide = Slide.model_validate_json(raw)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid slide data: {str(e)}")
+
+        # Render HTML without saving
+        html_content = await _render_slide(
+            storage, artifact_id, slidespec_dict, slide_index, slide_dict, validated_slide
+        )
 
     return {
         "slide_index": slide_index,
@@ -349,14 +681,16 @@ async def preview_slide(artifact_id: str, slide_index: int, slide_data: dict):
 
 
 @router.post("/artifacts/{artifact_id}/slides/{slide_index}/regenerate")
-async def regenerate_slide(artifact_id: str, slide_index: int, prompt: str = None):
+async def regenerate_slide(
+    artifact_id: str,
+    slide_index: int,
+    prompt: str = None,
+    sync: bool = Query(default=False, description="Write to disk before responding"),
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+    agent: AgentService = Depends(agent_dep),
+):
     """Regenerate a specific slide with optional new prompt."""
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
-
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
-
     slides = slidespec_dict.get("slides", [])
 
     if slide_index < 0 or slide_index >= len(slides):
@@ -366,9 +700,6 @@ async def regenerate_slide(artifact_id: str, slide_index: int, prompt: str = Non
     current_slide = slides[slide_index]
 
     # Use agent service to regenerate this slide
-    from app.services.agent_service import get_agent_service
-
-    agent = get_agent_service()
 
     slide_info = {
         "type": current_slide.get("type", "content"),
@@ -387,19 +718,27 @@ async def regenerate_slide(artifact_id: str, slide_index: int, prompt: str = Non
 
     language = slidespec_dict.get("deck", {}).get("language", "ko")
 
-    # Generate new slide
-    new_slide_dict = await agent.generate_single_slide(
-        slide_index, slide_info, presentation_context, language
+    # Generate new slide (validated by the agent); store its normalized dump,
+    # so later reads can rebuild the slide with model_construct
+    # (never from the response cache: regenerating should give a new variant)
+    validated_slide = await agent.generate_single_slide(
+        slide_index, slide_info, presentation_context, language, use_cache=False
     )
+    new_slide_dict = validated_slide.model_dump()
 
-    # Update storage
+    # Update storage, rendering HTML alongside the disk write when it is synchronous
     slides[slide_index] = new_slide_dict
-    storage.save_slidespec(artifact_id, slidespec_dict)
-
-    # Render HTML
-    validated_slide = Slide.model_validate(new_slide_dict)
-    renderer = HTMLSlideRenderer()
-    html_content = renderer.render_slide(validated_slide, slide_index)
+    render = _render_slide(
+        storage, artifact_id, slidespec_dict, slide_index, new_slide_dict, validated_slide
+    )
+    if sync:
+        html_content, _ = await asyncio.gather(
+            render,
+            storage.save_slidespec_async(artifact_id, slidespec_dict, slide_index),
+        )
+    else:
+        storage.save_slidespec_deferred(artifact_id, slidespec_dict, changed_slide=slide_index)
+        html_content = await render
 
     return {
         "slide_index": slide_index,
@@ -414,110 +753,122 @@ async def regenerate_slide(artifact_id: str, slide_index: int, prompt: str = Non
 async def export_with_progress(
     artifact_id: str,
     format: Literal["pptx"] = Query(default="pptx"),
+    storage: StorageService = Depends(storage_dep),
+    slidespec_dict: dict = Depends(slidespec_dep),
+    exporter: ExportService = Depends(export_dep),
 ):
     """Export artifact with SSE progress updates.
 
     Streams progress events during export:
     - progress: {current, total, status}
-    - complete: {download_url} (base64 encoded data)
+    - complete: {download_token, filename, size} - fetch the file from
+      /artifacts/{artifact_id}/download-token/{download_token}
     - error: {message}
     """
-    storage = _get_storage()
-    slidespec_dict = storage.get_slidespec(artifact_id)
+    slidespec = _get_parsed(storage, artifact_id, slidespec_dict)
+    total_slides = len(slidespec.slides)
 
-    if not slidespec_dict:
-        raise HTTPException(status_code=404, detail="Artifact not found")
+    # Shares the disk cache used by download_artifact
+    version = storage.get_slidespec_version(artifact_id)
+    cache_path = _export_cache_dir() / f"{artifact_id}-{version}.pptx"
 
-    slidespec = SlideSpec.model_validate(slidespec_dict)
-    total_slides = len(slidespec.slides)
+    filename = _sanitize_filename(slidespec.deck.title or "presentation")
 
-    async def generate_events() -> AsyncGenerator[dict, None]:
+    async def generate_events() -> AsyncGenerator[bytes, None]:
         try:
-            # Initial status
-            yield {
-                "event": "progress",
-                "data": json.dumps({
+            if not await asyncio.to_thread(_touch_export_file, cache_path):
+                # Initial status
+                yield sse_frame("progress", {
                     "current": 0,
                     "total": total_slides,
                     "status": "Initializing export...",
                     "phase": "init"
                 })
-            }
-
-            from app.services.html_capture_service import get_html_capture_service
-            from app.services.export_service import ExportService
-
-            capture_service = get_html_capture_service()
-            export_service = ExportService()
-            renderer = HTMLSlideRenderer()
-
-            images = []
 
-            # Capture each slide with progress updates
-            for idx, slide in enumerate(slidespec.slides):
-                yield {
-                    "event": "progress",
-                    "data": json.dumps({
-                        "current": idx,
+                capture_service = get_html_capture_service()
+                # Captured PNGs are spilled here as they arrive instead of being
+                # held in memory until the whole deck is done
+                capture_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="docai_capture_")
+
+                async def capture(idx: int, slide_dict: dict, slide: Slide) -> tuple[int, str]:
+                    html = await _render_slide(
+                        storage, artifact_id, slidespec_dict, idx, slide_dict, slide
+                    )
+                    image_bytes = await capture_service.capture_slide_html(html)
+                    image_path = os.path.join(capture_dir, f"{idx}.png")
+                    await asyncio.to_thread(Path(image_path).write_bytes, image_bytes)
+                    return idx, image_path
+
+                try:
+                    # Capture slides in parallel (bounded by the capture service's
+                    # browser pool), reporting progress as each one finishes
+                    slide_dicts = slidespec_dict["slides"]
+                    tasks = [
+                        asyncio.create_task(capture(idx, slide_dicts[idx], slide))
+                        for idx, slide in enumerate(slidespec.slides)
+                    ]
+                    image_paths: list[str] = [""] * total_slides
+                    try:
+                        for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                            idx, image_path = await next_done
+                            image_paths[idx] = image_path
+                            yield sse_frame("progress", {
+                                "current": completed,
+                                "total": total_slides,
+                                "status": f"Rendered slide {completed} of {total_slides}...",
+                                "phase": "rendering"
+                            })
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+
+                    # Creating PPTX
+                    yield sse_frame("progress", {
+                        "current": total_slides,
                         "total": total_slides,
-                        "status": f"Rendering slide {idx + 1} of {total_slides}...",
-                        "phase": "rendering"
+                        "status": "Creating PPTX file...",
+                        "phase": "creating"
                     })
-                }
 
-                # Render slide to HTML and capture as image
-                html = renderer.render_slide(slide, idx)
-                image_bytes = await capture_service.capture_slide_html(html)
-                images.append(image_bytes)
+                    # Collect speaker notes
+                    speaker_notes = [slide.speaker_notes for slide in slidespec.slides]
+
+                    # Write the PPTX straight into the export cache; the worker
+                    # process reads the images from disk, so none are pickled
+                    await _create_export(
+                        cache_path,
+                        lambda tmp: exporter.write_images_pptx_to_path(image_paths, tmp, speaker_notes),
+                    )
+                finally:
+                    await asyncio.to_thread(shutil.rmtree, capture_dir, True)
+
+            yield sse_frame("complete", {
+                "status": "Export complete!",
+                "filename": f"{filename}.pptx",
+                "download_token": _issue_download_token(artifact_id, cache_path, filename),
+                "size": cache_path.stat().st_size,
+                "total": total_slides,
+            })
 
-                # Small delay to allow SSE to be sent
-                await asyncio.sleep(0.05)
-
-            # Creating PPTX
-            yield {
-                "event": "progress",
-                "data": json.dumps({
-                    "current": total_slides,
-                    "total": total_slides,
-                    "status": "Creating PPTX file...",
-                    "phase": "creating"
-                })
-            }
+        except Exception as e:
+            logger.exception("Export stream error")
+            yield sse_frame("error", {
+                "status": "Export failed",
+                "message": str(e)
+            })
 
-            # Collect speaker notes
-            speaker_notes = [slide.speaker_notes for slide in slidespec.slides]
+    return sse_response(generate_events())
 
-            # Create PPTX from images
-            pptx_bytes = export_service.image_pptx_exporter.export_from_images(
-                images, speaker_notes
-            )
 
-            # Encode as base64 for transfer
-            pptx_base64 = base64.b64encode(pptx_bytes).decode('utf-8')
-
-            # Generate filename
-            title = slidespec.deck.title or "presentation"
-            filename = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-            filename = (filename[:50] or "presentation") + ".pptx"
-
-            yield {
-                "event": "complete",
-                "data": json.dumps({
-                    "status": "Export complete!",
-                    "filename": filename,
-                    "data": pptx_base64,
-                    "size": len(pptx_bytes)
-                })
-            }
+@router.get("/artifacts/{artifact_id}/download-token/{token}")
+async def download_with_token(artifact_id: str, token: str):
+    """Download a PPTX produced by export-stream, using its one-time token."""
+    entry = _download_tokens.pop(token)
+    if entry is None or entry[0] != artifact_id or entry[3] < time.monotonic():
+        raise HTTPException(status_code=404, detail="Download token not found or expired")
 
-        except Exception as e:
-            logger.exception("Export stream error")
-            yield {
-                "event": "error",
-                "data": json.dumps({
-                    "status": "Export failed",
-                    "message": str(e)
-                })
-            }
+    _, path, filename, _ = entry
+    if not await asyncio.to_thread(_touch_export_file, path):
+        raise HTTPException(status_code=404, detail="Export no longer available")
 
-    return EventSourceResponse(generate_events())
+    return _serve_export(path, PPTX_MEDIA_TYPE, filename, "pptx")
@@ -0,0 +1,42 @@
+"""Shared FastAPI dependencies for the API routers.
+
+Dependencies are coroutines on purpose: FastAPI runs plain-function
+dependencies in its threadpool, which costs far more than the lookup itself.
+"""
+
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException
+
+from app.services.agent_service import AgentService, get_agent_service
+from app.services.export_service import ExportService, get_export_service
+from app.services.storage_service import StorageService, get_storage_service
+
+
+@lru_cache
+def _agent_service() -> AgentService:
+    """Shared agent (get_agent_service builds a new one per call; agents hold no per-run state)."""
+    return get_agent_service()
+
+
+async def storage_dep() -> StorageService:
+    """Storage service singleton."""
+    return get_storage_service()
+
+
+async def agent_dep() -> AgentService:
+    """Agent service singleton."""
+    return _agent_service()
+
+
+async def export_dep() -> ExportService:
+    """Export service singleton."""
+    return get_export_service()
+
+
+async def slidespec_dep(artifact_id: str, storage: StorageService = Depends(storage_dep)) -> dict:
+    """The stored (mutable) slidespec dict for the path's artifact_id, or 404."""
+    slidespec = storage.get_slidespec(artifact_id)
+    if not slidespec:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return slidespec
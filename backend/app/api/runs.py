@@ -1,81 +1,73 @@
 """Runs API - Endpoints for creating and streaming document generation runs."""
 
 import asyncio
-import json
+import itertools
+import time
 import uuid
-from datetime import datetime
-from typing import AsyncGenerator
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Callable
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from sse_starlette.sse import EventSourceResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.schemas.run import (
     RunCreate,
     RunResponse,
+    RunState,
     RunStatus,
     DocumentType,
     SSEEvent,
     SSEEventType,
 )
-from app.services.agent_service import AgentService, get_agent_service
-from app.services.export_service import ExportService
-from app.services.storage_service import get_storage_service
+from app.api.sse import sse_frame, sse_response
+from app.api.deps import agent_dep, storage_dep
+from app.services.agent_service import AgentService
+from app.services.storage_service import StorageService
 
 router = APIRouter()
 
+# Stored run dicts carry extra keys (e.g. the original request); listings keep only these
+_RUN_RESPONSE_FIELDS = tuple(RunResponse.model_fields)
 
-def _get_storage():
-    """Get storage service instance."""
-    return get_storage_service()
+# Minimum seconds between disk writes of a streaming run's progress
+# (status changes and terminal events always persist)
+RUN_SAVE_INTERVAL = 0.2
 
 
-# Export for backward compatibility with artifacts.py
-def get_runs_storage() -> dict[str, dict]:
-    """Get runs storage (for internal use by other modules)."""
-    return _get_storage().get_all_runs()
+def _utcnow() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
 
 
-def get_slidespecs_storage() -> dict[str, dict]:
-    """Get slidespecs storage (for internal use by other modules)."""
-    return _get_storage().get_all_slidespecs()
-
-
-# Legacy names for artifacts.py compatibility
-_runs = property(lambda self: get_runs_storage())
-_slidespecs = property(lambda self: get_slidespecs_storage())
+def _run_response_dict(state: RunState) -> dict:
+    """A run in RunResponse shape, without building the model."""
+    return {field: getattr(state, field) for field in _RUN_RESPONSE_FIELDS}
 
 
 @router.post("/runs", response_model=RunResponse)
-async def create_run(request: RunCreate):
+async def create_run(request: RunCreate, storage: StorageService = Depends(storage_dep)):
     """Create a new document generation run."""
-    storage = _get_storage()
     run_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-
-    run_data = {
-        "run_id": run_id,
-        "status": RunStatus.CREATED,
-        "document_type": request.document_type,
-        "progress": 0.0,
-        "current_slide": None,
-        "total_slides": None,
-        "artifact_id": None,
-        "error": None,
-        "created_at": now,
-        "updated_at": now,
-        "request": request.model_dump(),
-    }
-
-    storage.save_run(run_id, run_data)
+    now = _utcnow()
 
-    return RunResponse(**run_data)
+    state = RunState(
+        run_id=run_id,
+        status=RunStatus.CREATED,
+        document_type=request.document_type,
+        created_at=now,
+        updated_at=now,
+        request=request.model_dump(),
+    )
+
+    storage.save_run(run_id, state)
+
+    return RunResponse(**state.to_dict())
 
 
 @router.get("/runs/{run_id}", response_model=RunResponse)
-async def get_run(run_id: str):
+async def get_run(run_id: str, storage: StorageService = Depends(storage_dep)):
     """Get the status of a run."""
-    storage = _get_storage()
     run_data = storage.get_run(run_id)
 
     if not run_data:
@@ -85,29 +77,90 @@ async def get_run(run_id: str):
 
 
 @router.get("/runs/{run_id}/stream")
-async def stream_run(run_id: str):
+async def stream_run(
+    run_id: str,
+    storage: StorageService = Depends(storage_dep),
+    agent_service: AgentService = Depends(agent_dep),
+):
     """Stream run events using Server-Sent Events.
 
     This endpoint starts the generation process and streams real-time updates
     including slide HTML as it's generated.
     """
-    storage = _get_storage()
     run_data = storage.get_run(run_id)
 
     if not run_data:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    request = RunCreate(**run_data["request"])
+    # Validated by create_run when stored, so skip validating it again
+    request = RunCreate.model_construct(**run_data["request"])
+    state = RunState.from_dict(run_data)
 
-    async def event_generator() -> AsyncGenerator[dict, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """Generate SSE events."""
-        try:
-            agent_service = get_agent_service()
+        # SSE ids only need to be unique per connection
+        event_ids = itertools.count()
+        last_save = time.monotonic()
+
+        def on_progress(event: SSEEvent) -> None:
+            nonlocal last_save
+            previous_status = state.status
+            status_value = event.data.get("status", "generating")
+            try:
+                state.status = RunStatus(status_value) if isinstance(status_value, str) else status_value
+            except ValueError:
+                state.status = RunStatus.GENERATING
+            state.progress = event.data.get("progress", 0)
+            state.current_slide = event.data.get("current_slide")
+            state.total_slides = event.data.get("total_slides")
+            state.updated_at = _utcnow()
+            # Memory is always current; disk is debounced to RUN_SAVE_INTERVAL
+            now = time.monotonic()
+            persist = (
+                state.status != previous_status
+                or now - last_save >= RUN_SAVE_INTERVAL
+            )
+            if persist:
+                last_save = now
+            storage.save_run(run_id, state, persist=persist)
+
+        def on_complete(event: SSEEvent) -> None:
+            state.status = RunStatus.COMPLETED
+            state.progress = 100.0
+            state.updated_at = _utcnow()
+
+            # Store slidespec
+            if "slidespec" in event.data:
+                slidespec_data = event.data["slidespec"]
+                slidespec_data["created_at"] = _utcnow().isoformat()
+                storage.save_slidespec(run_id, slidespec_data)
+                state.artifact_id = run_id
+                # Storage has just serialized the deck; splice those bytes into
+                # the frame instead of encoding the largest payload twice
+                slidespec_json = storage.get_slidespec_bytes(run_id)
+                if slidespec_json is not None:
+                    event.data["slidespec"] = orjson.Fragment(slidespec_json)
+
+            storage.save_run(run_id, state)
+
+        def on_error(event: SSEEvent) -> None:
+            state.status = RunStatus.FAILED
+            state.error = event.data.get("error")
+            state.updated_at = _utcnow()
+            storage.save_run(run_id, state)
+
+        # Events that update the stored run; the rest are only forwarded
+        handlers: dict[SSEEventType, Callable[[SSEEvent], None]] = {
+            SSEEventType.RUN_PROGRESS: on_progress,
+            SSEEventType.RUN_COMPLETE: on_complete,
+            SSEEventType.RUN_ERROR: on_error,
+        }
 
+        try:
             # Update run status
-            run_data["status"] = RunStatus.PLANNING
-            run_data["updated_at"] = datetime.utcnow()
-            storage.save_run(run_id, run_data)
+            state.status = RunStatus.PLANNING
+            state.updated_at = _utcnow()
+            storage.save_run(run_id, state)
 
             async for event in agent_service.generate_slides_stream(
                 prompt=request.prompt,
@@ -116,66 +169,33 @@ async def stream_run(run_id: str):
                 tone=request.tone,
                 slide_count=request.slide_count,
             ):
-                # Update run data based on event
-                if event.event == SSEEventType.RUN_PROGRESS:
-                    status_value = event.data.get("status", "generating")
-                    try:
-                        run_data["status"] = RunStatus(status_value) if isinstance(status_value, str) else status_value
-                    except ValueError:
-                        run_data["status"] = RunStatus.GENERATING
-                    run_data["progress"] = event.data.get("progress", 0)
-                    run_data["current_slide"] = event.data.get("current_slide")
-                    run_data["total_slides"] = event.data.get("total_slides")
-                    run_data["updated_at"] = datetime.utcnow()
-                    storage.save_run(run_id, run_data)
-
-                elif event.event == SSEEventType.RUN_COMPLETE:
-                    run_data["status"] = RunStatus.COMPLETED
-                    run_data["progress"] = 100.0
-                    run_data["updated_at"] = datetime.utcnow()
-
-                    # Store slidespec
-                    if "slidespec" in event.data:
-                        slidespec_data = event.data["slidespec"]
-                        slidespec_data["created_at"] = datetime.utcnow().isoformat()
-                        storage.save_slidespec(run_id, slidespec_data)
-                        run_data["artifact_id"] = run_id
-
-                    storage.save_run(run_id, run_data)
-
-                elif event.event == SSEEventType.RUN_ERROR:
-                    run_data["status"] = RunStatus.FAILED
-                    run_data["error"] = event.data.get("error")
-                    run_data["updated_at"] = datetime.utcnow()
-                    storage.save_run(run_id, run_data)
+                handler = handlers.get(event.event)
+                if handler is not None:
+                    handler(event)
 
                 # Yield event as SSE format
-                yield {
-                    "event": event.event.value,
-                    "id": str(uuid.uuid4()),
-                    "data": json.dumps(event.data, default=str),
-                }
+                yield sse_frame(
+                    event.event.value,
+                    event.data,
+                    id=next(event_ids),
+                    default=str,
+                    option=orjson.OPT_NON_STR_KEYS,
+                )
 
         except Exception as e:
-            run_data["status"] = RunStatus.FAILED
-            run_data["error"] = str(e)
-            run_data["updated_at"] = datetime.utcnow()
-            storage.save_run(run_id, run_data)
+            state.status = RunStatus.FAILED
+            state.error = str(e)
+            state.updated_at = _utcnow()
+            storage.save_run(run_id, state)
 
-            error_event = {
-                "event": SSEEventType.RUN_ERROR.value,
-                "id": str(uuid.uuid4()),
-                "data": json.dumps({"error": str(e)}),
-            }
-            yield error_event
+            yield sse_frame(SSEEventType.RUN_ERROR.value, {"error": str(e)}, id=next(event_ids))
 
-    return EventSourceResponse(event_generator())
+    return sse_response(event_generator())
 
 
 @router.post("/runs/{run_id}/cancel")
-async def cancel_run(run_id: str):
+async def cancel_run(run_id: str, storage: StorageService = Depends(storage_dep)):
     """Cancel a running generation."""
-    storage = _get_storage()
     run_data = storage.get_run(run_id)
 
     if not run_data:
@@ -184,17 +204,17 @@ async def cancel_run(run_id: str):
     if run_data["status"] in (RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED):
         raise HTTPException(status_code=400, detail="Run cannot be cancelled")
 
-    run_data["status"] = RunStatus.CANCELLED
-    run_data["updated_at"] = datetime.utcnow()
-    storage.save_run(run_id, run_data)
+    state = RunState.from_dict(run_data)
+    state.status = RunStatus.CANCELLED
+    state.updated_at = _utcnow()
+    storage.save_run(run_id, state)
 
     return {"message": "Run cancelled", "run_id": run_id}
 
 
 @router.delete("/runs/{run_id}")
-async def delete_run(run_id: str):
+async def delete_run(run_id: str, storage: StorageService = Depends(storage_dep)):
     """Delete a run and its associated artifact."""
-    storage = _get_storage()
     run_data = storage.get_run(run_id)
 
     if not run_data:
@@ -213,44 +233,43 @@ async def delete_run(run_id: str):
 async def list_runs(
     limit: int = Query(default=20, le=100),
     offset: int = Query(default=0, ge=0),
+    storage: StorageService = Depends(storage_dep),
 ):
     """List all runs."""
-    storage = _get_storage()
     runs, total = storage.list_runs(limit=limit, offset=offset)
 
-    return {
-        "items": [RunResponse(**r) for r in runs],
+    # Normalized through RunState (defaults, enums, datetimes) and projected,
+    # instead of building a RunResponse model per run
+    return ORJSONResponse({
+        "items": [_run_response_dict(RunState.from_dict(r)) for r in runs],
         "total": total,
         "limit": limit,
         "offset": offset,
-    }
+    })
 
 
 # Helper endpoint for quick testing without SSE
 @router.post("/runs/generate-sync")
-async def generate_sync(request: RunCreate):
+async def generate_sync(
+    request: RunCreate,
+    storage: StorageService = Depends(storage_dep),
+    agent_service: AgentService = Depends(agent_dep),
+):
     """Synchronously generate slides (for testing, not recommended for production)."""
-    storage = _get_storage()
     run_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-
-    run_data = {
-        "run_id": run_id,
-        "status": RunStatus.GENERATING,
-        "document_type": request.document_type,
-        "progress": 0.0,
-        "current_slide": None,
-        "total_slides": None,
-        "artifact_id": None,
-        "error": None,
-        "created_at": now,
-        "updated_at": now,
-        "request": request.model_dump(),
-    }
-    storage.save_run(run_id, run_data)
+    now = _utcnow()
+
+    state = RunState(
+        run_id=run_id,
+        status=RunStatus.GENERATING,
+        document_type=request.document_type,
+        created_at=now,
+        updated_at=now,
+        request=request.model_dump(),
+    )
+    storage.save_run(run_id, state)
 
     try:
-        agent_service = get_agent_service()
         slidespec = await agent_service.generate_slidespec(
             prompt=request.prompt,
             language=request.language,
@@ -263,21 +282,21 @@ async def generate_sync(request: RunCreate):
         slidespec_data["created_at"] = now.isoformat()
         storage.save_slidespec(run_id, slidespec_data)
 
-        run_data["status"] = RunStatus.COMPLETED
-        run_data["progress"] = 100.0
-        run_data["artifact_id"] = run_id
-        run_data["total_slides"] = len(slidespec.slides)
-        run_data["updated_at"] = datetime.utcnow()
-        storage.save_run(run_id, run_data)
+        state.status = RunStatus.COMPLETED
+        state.progress = 100.0
+        state.artifact_id = run_id
+        state.total_slides = len(slidespec.slides)
+        state.updated_at = _utcnow()
+        storage.save_run(run_id, state)
 
         return {
-            "run": RunResponse(**run_data),
+            "run": RunResponse(**state.to_dict()),
             "slidespec": slidespec.model_dump(),
         }
 
     except Exception as e:
-        run_data["status"] = RunStatus.FAILED
-        run_data["error"] = str(e)
-        run_data["updated_at"] = datetime.utcnow()
-        storage.save_run(run_id, run_data)
+        state.status = RunStatus.FAILED
+        state.error = str(e)
+        state.updated_at = _utcnow()
+        storage.save_run(run_id, state)
         raise HTTPException(status_code=500, detail=str(e))
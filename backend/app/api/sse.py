@@ -0,0 +1,70 @@
+"""Server-Sent Events framing for the streaming endpoints.
+
+Frames are built as bytes directly and sent through a plain StreamingResponse,
+skipping per-event object wrapping and re-encoding.
+"""
+
+import asyncio
+import contextlib
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+# Keep proxies (nginx) from buffering events
+SSE_HEADERS = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache", "Connection": "keep-alive"}
+
+# Comment frame sent while a stream is idle so proxies don't time the connection out
+PING_FRAME = b": ping\n\n"
+PING_INTERVAL = 15.0
+
+
+@lru_cache(maxsize=64)
+def _event_line(event: str) -> bytes:
+    """The constant `event:` line for an event name."""
+    return b"event: %b\n" % event.encode()
+
+
+def sse_frame(event: str, data: Any, id: str | int | None = None, **dumps_kwargs) -> bytes:
+    """Encode one SSE frame; data is JSON-encoded with orjson (never contains raw newlines)."""
+    payload = orjson.dumps(data, **dumps_kwargs)
+    if id is None:
+        return b"%bdata: %b\n\n" % (_event_line(event), payload)
+    if isinstance(id, int):
+        return b"%bid: %d\ndata: %b\n\n" % (_event_line(event), id, payload)
+    return b"%bid: %b\ndata: %b\n\n" % (_event_line(event), id.encode(), payload)
+
+
+async def _with_keepalive(frames: AsyncIterator[bytes], interval: float) -> AsyncIterator[bytes]:
+    """Pass frames through, inserting a ping whenever none arrives within interval."""
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(frames))
+            done, _ = await asyncio.wait((pending,), timeout=interval)
+            if not done:
+                yield PING_FRAME
+                continue
+            finished, pending = pending, None
+            try:
+                frame = finished.result()
+            except StopAsyncIteration:
+                return
+            yield frame
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await pending
+        await frames.aclose()
+
+
+def sse_response(frames: AsyncIterator[bytes], ping_interval: float = PING_INTERVAL) -> StreamingResponse:
+    """Stream pre-encoded SSE frames, with keep-alive pings."""
+    return StreamingResponse(
+        _with_keepalive(frames, ping_interval),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
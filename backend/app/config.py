@@ -28,9 +28,39 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8080
     debug: bool = True
+    # Threads for CPU-bound work offloaded from request handlers
+    # (rendering, DOCX export)
+    worker_threads: int = 8
+    # Headless browsers used in parallel for slide PNG capture (PPTX export)
+    capture_concurrency: int = 4
+    # Processes packing PPTX/DOCX files (defaults to the CPU count)
+    export_processes: int | None = None
+    # Slide generation LLM calls in flight at once per run
+    llm_concurrency: int = 4
+    # Process-wide cap on LLM requests per minute per provider (None: no cap)
+    llm_requests_per_minute: int | None = None
+    # Retries (exponential backoff with jitter, done by the provider SDK) on
+    # rate limits, overload and connection errors
+    llm_max_retries: int = 4
+    # Reuse LLM responses for exact prompt repeats. Off by default: with it,
+    # re-running an identical prompt returns the identical deck
+    llm_response_cache: bool = False
 
     # Storage
     storage_path: str = "./storage"
+    # Seconds between background flushes of edited slidespecs to disk
+    storage_flush_interval: float = 0.5
+
+    # Rendered PPTX/DOCX exports are kept on disk per artifact version and
+    # swept once they haven't been downloaded for this many seconds
+    export_cache_max_age: int = 3600
+
+    # Let a fronting nginx serve PPTX/DOCX downloads via X-Accel-Redirect.
+    # The export cache then lives in xaccel_export_dir, which nginx must
+    # expose as an internal location at xaccel_internal_prefix.
+    use_xaccel: bool = False
+    xaccel_export_dir: str = "/var/cache/artifacts"
+    xaccel_internal_prefix: str = "/_internal_artifacts/"
 
     # Database (optional)
     database_url: str | None = None
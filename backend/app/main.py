@@ -1,16 +1,20 @@
 """FastAPI Application Entry Point."""
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
 
 from app.config import get_settings
 from app.api import runs, artifacts
+from app.services.export_service import shutdown_export_pool
+from app.services.storage_service import get_storage_service
 
 
 @asynccontextmanager
@@ -24,12 +28,27 @@ async def lifespan(app: FastAPI):
     (storage_path / "artifacts").mkdir(exist_ok=True)
     (storage_path / "uploads").mkdir(exist_ok=True)
 
+    # Size the pool behind asyncio.to_thread used for render/export offloading
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.worker_threads)
+    )
+
+    sweeper = asyncio.create_task(artifacts.sweep_export_cache_periodically())
+
+    # Write-behind persistence for slide/element edits
+    storage = get_storage_service()
+    flusher = asyncio.create_task(storage.flush_periodically(settings.storage_flush_interval))
+
     print(f"DocAIAgent Backend starting...")
     print(f"Storage path: {storage_path.absolute()}")
     print(f"Default LLM: {settings.default_llm_provider}")
 
     yield
 
+    sweeper.cancel()
+    flusher.cancel()
+    await storage.flush_slidespecs()
+    shutdown_export_pool()
     print("DocAIAgent Backend shutting down...")
 
 
@@ -42,6 +61,7 @@ def create_app() -> FastAPI:
         description="AI-powered document generation agent API",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware
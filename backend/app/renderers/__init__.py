@@ -1,5 +1,5 @@
 """HTML/PPTX/DOCX Renderers."""
 
-from app.renderers.html_slide_renderer import HTMLSlideRenderer
+from app.renderers.html_slide_renderer import HTMLSlideRenderer, get_html_slide_renderer
 
-__all__ = ["HTMLSlideRenderer"]
+__all__ = ["HTMLSlideRenderer", "get_html_slide_renderer"]
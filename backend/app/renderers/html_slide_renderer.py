@@ -1,13 +1,42 @@
 """HTML Slide Renderer - Converts SlideSpec to HTML for preview."""
 
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+from pydantic import BaseModel
 
 from app.schemas.slidespec import SlideSpec, Slide, Element, SlideStyle, DeckStyle
 
 
+def _cheap_dump(model: BaseModel) -> dict[str, Any]:
+    """Plain-dict view of a model for templates, skipping model_dump's serializer.
+
+    Pydantic v2 keeps field values in __dict__; nested models are converted too.
+    """
+    return {
+        key: _cheap_dump(value) if isinstance(value, BaseModel) else value
+        for key, value in model.__dict__.items()
+    }
+
+
+_STYLE_RE = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _style_classes(background: str, color_scheme: str, text_color: str) -> str:
+    """CSS classes for a slide: background (bg-*/gradient-*), color scheme and text theme."""
+    return f"{background} scheme-{color_scheme} text-theme-{text_color}"
+
+
 class HTMLSlideRenderer:
     """Renders SlideSpec to HTML slides for real-time preview."""
 
@@ -42,14 +71,14 @@ class HTMLSlideRenderer:
     }
 
     # 어두운 배경 목록 (텍스트 색상 자동 결정용)
-    DARK_BACKGROUNDS = {
+    DARK_BACKGROUNDS = frozenset({
         "gradient-primary",
         "gradient-dark",
         "gradient-purple",
         "gradient-ocean",
         "gradient-accent",  # 보라 그라데이션
         "gradient-warm",    # 오렌지/핑크 그라데이션
-    }
+    })
 
     def __init__(self, templates_path: Path | str | None = None):
         """Initialize the renderer with templates path."""
@@ -59,14 +88,27 @@ class HTMLSlideRenderer:
             templates_path = Path(templates_path)
 
         self.templates_path = templates_path
+        # Templates are compiled once and never re-checked on disk; the
+        # compiled code is also kept in the per-user temp dir, so other worker
+        # processes and restarts skip parsing (entries are keyed by source checksum)
         self.env = Environment(
             loader=FileSystemLoader(str(templates_path)),
             autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=FileSystemBytecodeCache(),
         )
+        # Compile every layout (and base.html) up front; rendering then needs
+        # only a dict lookup and the first streamed slide pays no compile cost
+        self._templates: dict[str, Template] = {
+            name: self.env.get_template(name)
+            for name in {*self.LAYOUT_TEMPLATES.values(), "base.html"}
+        }
+        self._base_styles = self._read_base_styles()
 
     def get_layout_template(self, slide: Slide) -> str:
         """Get the template file name for a slide based on layout or type."""
-        layout_id = slide.layout.layout_id if slide.layout else None
+        layout_id = slide.layout["layout_id"] if slide.layout else None
 
         # Try to get template by layout_id
         if layout_id and layout_id in self.LAYOUT_TEMPLATES:
@@ -78,8 +120,20 @@ class HTMLSlideRenderer:
 
     def get_style_context(self, slide: Slide, deck_style: DeckStyle | None = None) -> dict[str, Any]:
         """슬라이드 스타일 컨텍스트 생성."""
-        style = slide.style
+        return self._resolve_style_context(slide.style, deck_style)
+
+    def prepare_deck_context(self, deck_style: DeckStyle | None = None) -> dict[str, Any]:
+        """Resolve deck-wide style once so per-slide renders can reuse it."""
+        return {
+            "deck_style": deck_style,
+            # Style context of every slide without its own style
+            "default_style_context": self._resolve_style_context(None, deck_style),
+        }
 
+    def _resolve_style_context(
+        self, style: SlideStyle | None, deck_style: DeckStyle | None
+    ) -> dict[str, Any]:
+        """Build the style context from a slide style, falling back to the deck style."""
         # 슬라이드 스타일 또는 덱 기본 스타일 사용
         background = "bg-white"
         color_scheme = "default"
@@ -100,23 +154,8 @@ class HTMLSlideRenderer:
         if text_color == "auto":
             text_color = "light" if background in self.DARK_BACKGROUNDS else "dark"
 
-        # CSS 클래스 생성
-        style_classes = []
-
-        # 배경 클래스
-        if background.startswith("gradient-"):
-            style_classes.append(background)
-        else:
-            style_classes.append(background)  # bg-white, bg-slate-50 등
-
-        # 색상 테마 클래스
-        style_classes.append(f"scheme-{color_scheme}")
-
-        # 텍스트 테마 클래스
-        style_classes.append(f"text-theme-{text_color}")
-
         return {
-            "style_classes": " ".join(style_classes),
+            "style_classes": _style_classes(background, color_scheme, text_color),
             "background": background,
             "color_scheme": color_scheme,
             "accent_color": accent_color,
@@ -124,10 +163,18 @@ class HTMLSlideRenderer:
             "is_dark_bg": text_color == "light",
         }
 
-    def render_slide(self, slide: Slide, slide_index: int = 0, deck_style: DeckStyle | None = None) -> str:
-        """Render a single slide to HTML."""
-        template_file = self.get_layout_template(slide)
-        template = self.env.get_template(template_file)
+    def render_slide(
+        self,
+        slide: Slide,
+        slide_index: int = 0,
+        deck_style: DeckStyle | None = None,
+        deck_context: dict[str, Any] | None = None,
+    ) -> str:
+        """Render a single slide to HTML.
+
+        deck_context (from prepare_deck_context) takes precedence over deck_style.
+        """
+        template = self._templates[self.get_layout_template(slide)]
 
         # Prepare elements data
         elements = []
@@ -137,25 +184,27 @@ class HTMLSlideRenderer:
                 "kind": elem.kind,
                 "role": elem.role,
                 "content": elem.content,
-                "citations": [c.model_dump() for c in elem.citations] if elem.citations else [],
-                "style_overrides": elem.style_overrides.model_dump() if elem.style_overrides else None,
+                "citations": [_cheap_dump(c) for c in elem.citations] if elem.citations else [],
+                "style_overrides": elem.style_overrides,
                 "tailwind_classes": elem.tailwind_classes or "",
             })
 
         # Prepare citations data
-        citations = []
-        if slide.citations:
-            for c in slide.citations:
-                citations.append(c.model_dump())
+        citations = [_cheap_dump(c) for c in slide.citations] if slide.citations else []
 
         # 스타일 컨텍스트 생성
-        style_context = self.get_style_context(slide, deck_style)
+        if deck_context is None:
+            style_context = self.get_style_context(slide, deck_style)
+        elif slide.style is None:
+            style_context = deck_context["default_style_context"]
+        else:
+            style_context = self.get_style_context(slide, deck_context["deck_style"])
 
         context = {
             "slide_id": slide.slide_id,
             "slide_type": slide.type,
             "slide_index": slide_index,
-            "layout_id": slide.layout.layout_id if slide.layout else "one_column",
+            "layout_id": slide.layout["layout_id"] if slide.layout else "one_column",
             "title": slide.title,
             "elements": elements,
             "citations": citations,
@@ -167,23 +216,28 @@ class HTMLSlideRenderer:
 
         return template.render(**context)
 
-    def render_deck(self, slidespec: SlideSpec) -> str:
-        """Render the entire deck to HTML."""
-        base_template = self.env.get_template("base.html")
-        deck_style = slidespec.style
+    def render_deck(self, slidespec: SlideSpec, slides_html: Iterable[str] | None = None) -> str:
+        """Render the entire deck to HTML.
 
-        slides_html = []
-        for idx, slide in enumerate(slidespec.slides):
-            slide_html = self.render_slide(slide, idx, deck_style)
-            slides_html.append(slide_html)
+        slides_html may supply already rendered slides (in order) to skip per-slide rendering.
+        """
+        return self._templates["base.html"].render(self._deck_template_context(slidespec, slides_html))
 
-        content = "\n".join(slides_html)
+    def _deck_template_context(
+        self, slidespec: SlideSpec, slides_html: Iterable[str] | None
+    ) -> dict[str, Any]:
+        """Context for base.html; slides are fed to the template one at a time, never joined."""
+        return {
+            "deck_title": slidespec.deck.title,
+            "language": slidespec.deck.language,
+            "slides": self._iter_slides_html(slidespec) if slides_html is None else slides_html,
+        }
 
-        return base_template.render(
-            deck_title=slidespec.deck.title,
-            language=slidespec.deck.language,
-            content=content,
-        )
+    def _iter_slides_html(self, slidespec: SlideSpec) -> Iterator[str]:
+        """Render each slide of a deck lazily."""
+        deck_context = self.prepare_deck_context(slidespec.style)
+        for idx, slide in enumerate(slidespec.slides):
+            yield self.render_slide(slide, idx, deck_context=deck_context)
 
     def render_slide_dict(
         self,
@@ -204,12 +258,26 @@ class HTMLSlideRenderer:
 
     def get_base_styles(self) -> str:
         """Get the base CSS styles for slides."""
+        return self._base_styles
+
+    def _read_base_styles(self) -> str:
+        """Extract the <style> block of base.html."""
         base_template_path = self.templates_path / "base.html"
         if base_template_path.exists():
             content = base_template_path.read_text(encoding="utf-8")
-            # Extract style content from base template
-            import re
-            style_match = re.search(r'<style>(.*?)</style>', content, re.DOTALL)
+            style_match = _STYLE_RE.search(content)
             if style_match:
                 return style_match.group(1)
         return ""
+
+
+# Singleton instance
+_renderer: HTMLSlideRenderer | None = None
+
+
+def get_html_slide_renderer() -> HTMLSlideRenderer:
+    """Get the shared HTML slide renderer (one compiled template environment)."""
+    global _renderer
+    if _renderer is None:
+        _renderer = HTMLSlideRenderer()
+    return _renderer
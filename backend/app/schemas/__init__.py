@@ -19,6 +19,7 @@ from app.schemas.slidespec import (
 from app.schemas.run import (
     RunCreate,
     RunResponse,
+    RunState,
     RunStatus,
     SSEEvent,
 )
@@ -40,6 +41,7 @@ __all__ = [
     "ColorScheme",
     "RunCreate",
     "RunResponse",
+    "RunState",
     "RunStatus",
     "SSEEvent",
 ]
@@ -1,6 +1,7 @@
 """Run-related Pydantic schemas."""
 
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Literal
 from pydantic import BaseModel, Field
@@ -54,6 +55,45 @@ class RunResponse(BaseModel):
     updated_at: datetime
 
 
+@dataclass(slots=True)
+class RunState:
+    """Mutable run record used while a run is being updated (attribute access, no validation)."""
+
+    run_id: str
+    status: RunStatus
+    document_type: DocumentType
+    created_at: datetime
+    updated_at: datetime
+    progress: float = 0.0
+    current_slide: int | None = None
+    total_slides: int | None = None
+    artifact_id: str | None = None
+    error: str | None = None
+    request: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunState":
+        """Build from a stored run dict, ignoring unknown keys.
+
+        Runs read back from disk hold enum values and timestamps as strings;
+        they are converted so every RunState has the same types.
+        """
+        values = {name: data[name] for name in _RUN_STATE_FIELDS if name in data}
+        values["status"] = RunStatus(values["status"])
+        values["document_type"] = DocumentType(values["document_type"])
+        for name in ("created_at", "updated_at"):
+            if isinstance(values[name], str):
+                values[name] = datetime.fromisoformat(values[name])
+        return cls(**values)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Shallow dict in the stored run format."""
+        return {name: getattr(self, name) for name in _RUN_STATE_FIELDS}
+
+
+_RUN_STATE_FIELDS = tuple(f.name for f in fields(RunState))
+
+
 class SSEEventType(str, Enum):
     """SSE event types."""
 
@@ -74,13 +114,18 @@ class SSEEventType(str, Enum):
     SECTION_COMPLETE = "section_complete"
 
 
-class SSEEvent(BaseModel):
-    """Server-Sent Event payload."""
+@dataclass(slots=True)
+class SSEEvent:
+    """Server-Sent Event payload.
+
+    Built internally for every streamed event and never validated, so it is a
+    plain dataclass rather than a model.
+    """
 
     event: SSEEventType
     run_id: str
-    data: dict[str, Any] = Field(default_factory=dict)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class SlideChunkData(BaseModel):
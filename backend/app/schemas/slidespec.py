@@ -1,15 +1,19 @@
 """SlideSpec Pydantic schemas based on specs/schemas/ir/slidespec_v1.schema.json"""
 
-from typing import Literal, Any
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Annotated, Literal, Any, NotRequired, TypedDict
+from pydantic import BaseModel, ConfigDict, Field
 
+# Leaf structures that only appear nested in other models are TypedDicts:
+# pydantic validates them into plain dicts, without building a model per item.
 
-class LayoutRef(BaseModel):
+
+class LayoutRef(TypedDict):
     """Layout reference for a slide."""
 
-    layout_id: str = Field(..., min_length=1, max_length=120)
-    variant: str | None = Field(None, max_length=120)
-    hints: dict[str, Any] | None = None
+    layout_id: Annotated[str, Field(min_length=1, max_length=120)]
+    variant: NotRequired[Annotated[str | None, Field(max_length=120)]]
+    hints: NotRequired[dict[str, Any] | None]
 
 
 class Citation(BaseModel):
@@ -25,6 +29,13 @@ class Citation(BaseModel):
     url: str | None = None
 
 
+def _rehydrate_citations(items: list[dict] | None) -> list[Citation] | None:
+    """Rebuild citations from trusted data."""
+    if items is None:
+        return None
+    return [Citation.model_construct(**c) for c in items]
+
+
 class TextContent(BaseModel):
     """Text element content."""
 
@@ -32,11 +43,11 @@ class TextContent(BaseModel):
     format: Literal["plain", "markdown"] = "plain"
 
 
-class BulletsItem(BaseModel):
+class BulletsItem(TypedDict):
     """Nested bullet item."""
 
-    text: str = Field(..., min_length=1, max_length=2000)
-    children: list["BulletsItem"] | None = None
+    text: Annotated[str, Field(min_length=1, max_length=2000)]
+    children: NotRequired[list["BulletsItem"] | None]
 
 
 class BulletsContent(BaseModel):
@@ -55,7 +66,7 @@ class ImageContent(BaseModel):
     crop_hint: Literal["contain", "cover", "center_crop"] | None = None
 
 
-class ChartPoint(BaseModel):
+class ChartPoint(TypedDict):
     """Single data point in a chart series."""
 
     x: str | float | int
@@ -89,15 +100,15 @@ class TableContent(BaseModel):
     options: dict[str, Any] | None = None
 
 
-class StyleOverrides(BaseModel):
+class StyleOverrides(TypedDict, total=False):
     """Element style overrides."""
 
-    font_family: str | None = Field(None, max_length=200)
-    font_pt: float | None = Field(None, ge=1, le=200)
-    bold: bool | None = None
-    italic: bool | None = None
-    color_hex: str | None = None
-    align: Literal["left", "center", "right", "justify"] | None = None
+    font_family: Annotated[str | None, Field(max_length=200)]
+    font_pt: Annotated[float | None, Field(ge=1, le=200)]
+    bold: bool | None
+    italic: bool | None
+    color_hex: str | None
+    align: Literal["left", "center", "right", "justify"] | None
 
 
 # 배경 프리셋 타입
@@ -130,6 +141,9 @@ ColorScheme = Literal[
 class SlideStyle(BaseModel):
     """슬라이드 스타일 설정."""
 
+    # Immutable so identical styles can be shared between slides
+    model_config = ConfigDict(frozen=True)
+
     background: BackgroundPreset = Field(
         default="bg-white",
         description="슬라이드 배경 프리셋"
@@ -149,6 +163,19 @@ class SlideStyle(BaseModel):
     )
 
 
+@lru_cache(maxsize=256)
+def _shared_slide_style(
+    background: str, color_scheme: str, accent_color: str | None, text_color: str
+) -> SlideStyle:
+    """One SlideStyle per distinct combination, shared by every slide that uses it."""
+    return SlideStyle.model_construct(
+        background=background,
+        color_scheme=color_scheme,
+        accent_color=accent_color,
+        text_color=text_color,
+    )
+
+
 class Element(BaseModel):
     """Slide element (text, bullets, image, chart, table, etc.)."""
 
@@ -161,6 +188,13 @@ class Element(BaseModel):
     tailwind_classes: str | None = Field(None, max_length=1000, description="Custom Tailwind CSS classes for this element")
     extensions: dict[str, Any] | None = None
 
+    @classmethod
+    def fast_rehydrate(cls, data: dict[str, Any]) -> "Element":
+        """Rebuild an Element from trusted (already validated) data without validation."""
+        fields = dict(data)
+        fields["citations"] = _rehydrate_citations(fields.get("citations"))
+        return cls.model_construct(**fields)
+
 
 class Slide(BaseModel):
     """Single slide in a deck."""
@@ -179,6 +213,26 @@ class Slide(BaseModel):
     tailwind_classes: str | None = Field(None, max_length=1000, description="Custom Tailwind CSS classes for the slide container")
     extensions: dict[str, Any] | None = None
 
+    @classmethod
+    def fast_rehydrate(cls, data: dict[str, Any]) -> "Slide":
+        """Rebuild a Slide from trusted (already validated) data without validation.
+
+        Stored and re-emitted slides were validated when first built, so running
+        the full validator pipeline again on every read is wasted work.
+        """
+        fields = dict(data)
+        style = fields.get("style")
+        if style is not None:
+            fields["style"] = _shared_slide_style(
+                style.get("background", "bg-white"),
+                style.get("color_scheme", "default"),
+                style.get("accent_color"),
+                style.get("text_color", "auto"),
+            )
+        fields["citations"] = _rehydrate_citations(fields.get("citations"))
+        fields["elements"] = [Element.fast_rehydrate(e) for e in fields.get("elements", [])]
+        return cls.model_construct(**fields)
+
 
 class DeckMeta(BaseModel):
     """Deck metadata."""
@@ -194,23 +248,27 @@ class DeckMeta(BaseModel):
 class TemplateRef(BaseModel):
     """Template and brand kit reference."""
 
+    model_config = ConfigDict(frozen=True)
+
     template_id: str | None = Field(None, min_length=1)
     brand_kit_id: str | None = Field(None, min_length=1)
     slide_size: str | None = Field(None, max_length=80)
 
 
-class AssetRef(BaseModel):
+class AssetRef(TypedDict):
     """Asset reference."""
 
-    asset_id: str = Field(..., min_length=1, max_length=120)
-    kind: Literal["image", "file", "chart_data", "other"] | None = None
-    label: str | None = Field(None, max_length=200)
-    hint: str | None = Field(None, max_length=1000)
+    asset_id: Annotated[str, Field(min_length=1, max_length=120)]
+    kind: NotRequired[Literal["image", "file", "chart_data", "other"] | None]
+    label: NotRequired[Annotated[str | None, Field(max_length=200)]]
+    hint: NotRequired[Annotated[str | None, Field(max_length=1000)]]
 
 
 class DeckStyle(BaseModel):
     """전체 덱에 적용되는 기본 스타일."""
 
+    model_config = ConfigDict(frozen=True)
+
     default_background: BackgroundPreset = Field(
         default="bg-white",
         description="기본 슬라이드 배경"
@@ -239,3 +297,15 @@ class SlideSpec(BaseModel):
     assets: list[AssetRef] | None = None
     slides: list[Slide] = Field(..., min_length=1, max_length=500)
     extensions: dict[str, Any] | None = None
+
+    @classmethod
+    def fast_rehydrate(cls, data: dict[str, Any]) -> "SlideSpec":
+        """Rebuild a SlideSpec from trusted (already validated) data without validation."""
+        fields = dict(data)
+        fields["deck"] = DeckMeta.model_construct(**fields.get("deck", {}))
+        if fields.get("template") is not None:
+            fields["template"] = TemplateRef.model_construct(**fields["template"])
+        if fields.get("style") is not None:
+            fields["style"] = DeckStyle.model_construct(**fields["style"])
+        fields["slides"] = [Slide.fast_rehydrate(s) for s in fields.get("slides", [])]
+        return cls.model_construct(**fields)
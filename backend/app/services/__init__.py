@@ -1,12 +1,45 @@
-"""Business logic services."""
+"""Business logic services.
 
-from app.services.llm_service import LLMService, get_llm_service
-from app.services.agent_service import AgentService
-from app.services.export_service import ExportService
+Services are imported lazily (PEP 562): importing one submodule such as
+app.services.storage_service no longer loads the LLM clients and the
+PPTX/DOCX libraries through this package.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.services.llm_service import LLMService, get_llm_service
+    from app.services.agent_service import AgentService
+    from app.services.export_service import ExportService, get_export_service
+
+# Exported name -> defining module
+_LAZY_EXPORTS = {
+    "LLMService": "app.services.llm_service",
+    "get_llm_service": "app.services.llm_service",
+    "AgentService": "app.services.agent_service",
+    "ExportService": "app.services.export_service",
+    "get_export_service": "app.services.export_service",
+}
 
 __all__ = [
     "LLMService",
     "get_llm_service",
     "AgentService",
     "ExportService",
+    "get_export_service",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,15 +1,24 @@
 """Agent Service - Orchestrates slide/document generation with LLM."""
 
-import json
+import asyncio
+import hashlib
+import logging
 import uuid
 from datetime import datetime
 from typing import AsyncGenerator, Callable, Any
 
+import orjson
+from pydantic import ValidationError
+
+from app.cache import LRUCache
+from app.config import get_settings
 from app.services.llm_service import LLMService, get_llm_service
-from app.renderers.html_slide_renderer import HTMLSlideRenderer
-from app.schemas.slidespec import SlideSpec
+from app.renderers.html_slide_renderer import get_html_slide_renderer
+from app.schemas.slidespec import Slide, SlideSpec
 from app.schemas.run import SSEEvent, SSEEventType, RunStatus
 
+logger = logging.getLogger(__name__)
+
 
 # System prompts for different stages
 OUTLINE_SYSTEM_PROMPT = """You are an expert presentation consultant who creates well-structured slide outlines.
@@ -227,13 +236,60 @@ Rules:
 - Content slides: vary between light and gradient
 - Output ONLY valid JSON for ONE slide"""
 
+# Sent with the single-slide system prompt when a generated slide fails validation
+SLIDE_REPAIR_PROMPT = """Your previous output for this slide was not a valid slide.
+
+Previous output:
+{output}
+
+Validation error:
+{error}
+
+Fix the problems and output ONLY the corrected JSON for the slide, keeping its content."""
+
+# Repair requests made for one slide before its error is raised
+SLIDE_REPAIR_ATTEMPTS = 2
+
+# LLM responses kept for exact repeats of a prompt
+LLM_RESPONSE_CACHE_SIZE = 256
+
+# Section header backgrounds, alternated by section index
+SECTION_BACKGROUNDS = ("gradient-accent", "gradient-dark", "gradient-ocean", "gradient-purple")
+
 
 class AgentService:
     """Service for generating presentations using LLM."""
 
     def __init__(self, llm_service: LLMService | None = None):
         self.llm = llm_service or get_llm_service()
-        self.renderer = HTMLSlideRenderer()
+        self.renderer = get_html_slide_renderer()
+        # Exact-match cache of JSON responses that parsed/validated, keyed by
+        # a hash of (provider, model, system prompt, user prompt)
+        self._responses: LRUCache[bytes, str] = LRUCache(maxsize=LLM_RESPONSE_CACHE_SIZE)
+
+    def _response_key(self, prompt: str, system: str | None) -> bytes:
+        """Cache key for an LLM call."""
+        parts = (self.llm.provider_name, self.llm.model, system or "", prompt)
+        return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).digest()
+
+    async def _generate_json_text(
+        self, prompt: str, system: str | None, use_cache: bool | None
+    ) -> tuple[str, bytes | None]:
+        """JSON text for a prompt, from the response cache when allowed.
+
+        use_cache=None follows the llm_response_cache setting. Returns the
+        cache key to store the text under once it has been parsed
+        successfully (None when caching is off).
+        """
+        if use_cache is None:
+            use_cache = get_settings().llm_response_cache
+        if not use_cache:
+            return await self.llm.generate_json_text(prompt, system), None
+        key = self._response_key(prompt, system)
+        text = self._responses.get(key)
+        if text is None:
+            text = await self.llm.generate_json_text(prompt, system)
+        return text, key
 
     async def generate_outline(
         self,
@@ -242,8 +298,9 @@ class AgentService:
         audience: str | None = None,
         tone: str | None = None,
         slide_count: int | None = None,
+        use_cache: bool | None = None,
     ) -> dict:
-        """Generate a presentation outline."""
+        """Generate a presentation outline (use_cache as for generate_single_slide)."""
         user_prompt = f"""Create a presentation outline for:
 {prompt}
 
@@ -255,7 +312,10 @@ Requirements:
 
 Create a well-structured outline."""
 
-        result = await self.llm.generate_json(user_prompt, OUTLINE_SYSTEM_PROMPT)
+        text, key = await self._generate_json_text(user_prompt, OUTLINE_SYSTEM_PROMPT, use_cache)
+        result = orjson.loads(text)
+        if key is not None:
+            self._responses.set(key, text)
         return result
 
     async def generate_slidespec(
@@ -271,7 +331,7 @@ Create a well-structured outline."""
         # Build the user prompt
         outline_text = ""
         if outline:
-            outline_text = f"\n\nOutline to follow:\n{json.dumps(outline, ensure_ascii=False, indent=2)}"
+            outline_text = f"\n\nOutline to follow:\n{orjson.dumps(outline).decode()}"
 
         user_prompt = f"""Create a complete presentation for:
 {prompt}
@@ -285,10 +345,10 @@ Requirements:
 
 Generate the complete SlideSpec JSON."""
 
-        result = await self.llm.generate_json(user_prompt, SLIDESPEC_SYSTEM_PROMPT)
+        result = await self.llm.generate_json_text(user_prompt, SLIDESPEC_SYSTEM_PROMPT)
 
-        # Validate and return as SlideSpec
-        return SlideSpec.model_validate(result)
+        # Parse and validate in one pass, without an intermediate dict
+        return SlideSpec.model_validate_json(result)
 
     async def generate_single_slide(
         self,
@@ -296,8 +356,14 @@ Generate the complete SlideSpec JSON."""
         slide_info: dict,
         presentation_context: dict,
         language: str = "ko",
-    ) -> dict:
-        """Generate a single slide based on outline info."""
+        use_cache: bool | None = None,
+    ) -> Slide:
+        """Generate and validate a single slide based on outline info.
+
+        With use_cache, an identical earlier request returns the same slide
+        without calling the LLM; None follows the llm_response_cache setting.
+        """
+        slide_id = f"s{slide_index + 1}"
         slide_type = slide_info.get("type", "content")
         title = slide_info.get("title", "")
         key_points = slide_info.get("key_points", [])
@@ -320,7 +386,7 @@ Suggested style:
 Slide info:
 - Type: {slide_type}
 - Title: {title}
-- Key points to cover: {json.dumps(key_points, ensure_ascii=False)}
+- Key points to cover: {orjson.dumps(key_points).decode()}
 - Suggested layout: {suggested_layout}
 {style_suggestion}
 
@@ -331,16 +397,48 @@ Context:
 - Total slides: {presentation_context.get('total_slides', 10)}
 - Current position: Slide {slide_index + 1} of {presentation_context.get('total_slides', 10)}
 
-Generate the slide JSON with slide_id "s{slide_index + 1}".
+Generate the slide JSON with slide_id "{slide_id}".
 Choose an appropriate layout and style for this slide's content and position in the presentation.
 Use gradient backgrounds for title/section/closing slides, and vary styles for content slides."""
 
-        result = await self.llm.generate_json(user_prompt, SINGLE_SLIDE_SYSTEM_PROMPT)
+        text, key = await self._generate_json_text(user_prompt, SINGLE_SLIDE_SYSTEM_PROMPT, use_cache)
+
+        # Invalid output is sent back for repair rather than failing the whole run
+        for attempt in range(SLIDE_REPAIR_ATTEMPTS + 1):
+            try:
+                slide = self._parse_slide(text, slide_id)
+                break
+            except ValueError as e:
+                if attempt == SLIDE_REPAIR_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "Slide %d invalid, requesting repair (%d/%d): %s",
+                    slide_index + 1, attempt + 1, SLIDE_REPAIR_ATTEMPTS, e,
+                )
+                repair_prompt = SLIDE_REPAIR_PROMPT.format(output=text, error=str(e)[:2000])
+                text = await self.llm.generate_json_text(repair_prompt, SINGLE_SLIDE_SYSTEM_PROMPT)
 
-        # Ensure slide_id is correct
-        result["slide_id"] = f"s{slide_index + 1}"
+        if key is not None:
+            self._responses.set(key, text)
+        return slide
 
-        return result
+    @staticmethod
+    def _parse_slide(text: str, slide_id: str) -> Slide:
+        """Validate a generated slide's JSON text, forcing its slide_id."""
+        try:
+            # Parse and validate in one pass, without an intermediate dict
+            slide = Slide.model_validate_json(text)
+        except ValidationError:
+            # e.g. the model left out slide_id; set it before validating
+            data = orjson.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError(f"Expected a JSON object for the slide, got {type(data).__name__}")
+            data["slide_id"] = slide_id
+            return Slide.model_validate(data)
+
+        # Ensure slide_id is correct
+        slide.slide_id = slide_id
+        return slide
 
     async def generate_slides_stream(
         self,
@@ -350,14 +448,15 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
         tone: str | None = None,
         slide_count: int | None = None,
         on_event: Callable[[SSEEvent], Any] | None = None,
+        use_cache: bool | None = None,
     ) -> AsyncGenerator[SSEEvent, None]:
         """Generate slides with real-time streaming updates.
 
         Yields SSEEvent objects for each stage of generation.
         Each slide is generated and rendered individually for real-time feedback.
+        use_cache is passed to the outline and slide calls.
         """
         run_id = str(uuid.uuid4())
-        generated_slides = []
 
         # Start event
         start_event = SSEEvent(
@@ -384,17 +483,17 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
                 await on_event(progress_event)
             yield progress_event
 
-            print(f"[LLM] Generating outline...")
+            logger.debug("Generating outline...")
             outline = await self.generate_outline(
-                prompt, language, audience, tone, slide_count
+                prompt, language, audience, tone, slide_count, use_cache
             )
-            print(f"[LLM] Outline generated: {outline.get('title', 'Untitled')}")
+            logger.debug("Outline generated: %s", outline.get("title", "Untitled"))
 
             # Build slide list from outline
             slide_infos = self._build_slide_list_from_outline(outline)
             total_slides = len(slide_infos)
 
-            print(f"[Planning] Total slides to generate: {total_slides}")
+            logger.debug("Total slides to generate: %d", total_slides)
 
             # Presentation context for slide generation
             presentation_context = {
@@ -419,83 +518,100 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
                 await on_event(progress_event)
             yield progress_event
 
-            # Generate and render each slide one by one
-            for idx, slide_info in enumerate(slide_infos):
-                print(f"[LLM] Generating slide {idx + 1}/{total_slides}: {slide_info.get('title', 'Untitled')}")
-
-                # Slide start
-                slide_start_event = SSEEvent(
-                    event=SSEEventType.SLIDE_START,
-                    run_id=run_id,
-                    data={
-                        "slide_id": f"s{idx + 1}",
-                        "slide_index": idx,
-                        "total_slides": total_slides,
-                        "slide_title": slide_info.get("title", ""),
-                    },
-                )
-                if on_event:
-                    await on_event(slide_start_event)
-                yield slide_start_event
-
-                # Generate single slide
-                slide_dict = await self.generate_single_slide(
-                    idx, slide_info, presentation_context, language
-                )
-                generated_slides.append(slide_dict)
-
-                # Validate and render
-                from app.schemas.slidespec import Slide
-                slide = Slide.model_validate(slide_dict)
-
-                # Render slide HTML
-                html = self.renderer.render_slide(slide, idx)
-                print(f"[HTML Generated] Slide {idx + 1}: {len(html)} bytes")
-
-                # Slide chunk (complete HTML for this slide)
-                slide_chunk_event = SSEEvent(
-                    event=SSEEventType.SLIDE_CHUNK,
-                    run_id=run_id,
-                    data={
-                        "slide_id": slide.slide_id,
-                        "slide_index": idx,
-                        "html": html,
-                        "is_complete": True,
-                    },
-                )
-                if on_event:
-                    await on_event(slide_chunk_event)
-                yield slide_chunk_event
-
-                # Slide complete
-                slide_complete_event = SSEEvent(
-                    event=SSEEventType.SLIDE_COMPLETE,
-                    run_id=run_id,
-                    data={
-                        "slide_id": slide.slide_id,
-                        "slide_index": idx,
-                    },
-                )
-                if on_event:
-                    await on_event(slide_complete_event)
-                yield slide_complete_event
-
-                # Update progress
-                progress = 10.0 + (idx + 1) / total_slides * 85.0
-                progress_event = SSEEvent(
-                    event=SSEEventType.RUN_PROGRESS,
-                    run_id=run_id,
-                    data={
-                        "status": RunStatus.GENERATING.value,
-                        "progress": progress,
-                        "current_slide": idx + 1,
-                        "total_slides": total_slides,
-                        "message": f"Generated slide {idx + 1} of {total_slides}",
-                    },
-                )
-                if on_event:
-                    await on_event(progress_event)
-                yield progress_event
+            # Slides are generated concurrently (at most llm_concurrency LLM calls
+            # at a time) but streamed in deck order: a slide that finishes early
+            # stays in its task until the slides before it have been sent
+            semaphore = asyncio.Semaphore(get_settings().llm_concurrency)
+
+            async def generate(idx: int, slide_info: dict) -> Slide:
+                async with semaphore:
+                    logger.debug(
+                        "Generating slide %d/%d: %s", idx + 1, total_slides, slide_info.get("title", "Untitled")
+                    )
+                    return await self.generate_single_slide(
+                        idx, slide_info, presentation_context, language, use_cache
+                    )
+
+            tasks = [
+                asyncio.create_task(generate(idx, slide_info))
+                for idx, slide_info in enumerate(slide_infos)
+            ]
+            # Kept as models in deck order: SlideSpec accepts them below without revalidating
+            generated_slides: list = [None] * total_slides
+            try:
+                for idx, slide_info in enumerate(slide_infos):
+                    # Slide start
+                    slide_start_event = SSEEvent(
+                        event=SSEEventType.SLIDE_START,
+                        run_id=run_id,
+                        data={
+                            "slide_id": f"s{idx + 1}",
+                            "slide_index": idx,
+                            "total_slides": total_slides,
+                            "slide_title": slide_info.get("title", ""),
+                        },
+                    )
+                    if on_event:
+                        await on_event(slide_start_event)
+                    yield slide_start_event
+
+                    slide = await tasks[idx]
+                    generated_slides[idx] = slide
+
+                    # Render slide HTML off the event loop so other streams keep flowing
+                    html = await asyncio.to_thread(self.renderer.render_slide, slide, idx)
+                    logger.debug("Rendered slide %d: %d chars", idx + 1, len(html))
+
+                    # Slide chunk (complete HTML for this slide)
+                    slide_chunk_event = SSEEvent(
+                        event=SSEEventType.SLIDE_CHUNK,
+                        run_id=run_id,
+                        data={
+                            "slide_id": slide.slide_id,
+                            "slide_index": idx,
+                            "html": html,
+                            "is_complete": True,
+                        },
+                    )
+                    if on_event:
+                        await on_event(slide_chunk_event)
+                    yield slide_chunk_event
+
+                    # Slide complete
+                    slide_complete_event = SSEEvent(
+                        event=SSEEventType.SLIDE_COMPLETE,
+                        run_id=run_id,
+                        data={
+                            "slide_id": slide.slide_id,
+                            "slide_index": idx,
+                        },
+                    )
+                    if on_event:
+                        await on_event(slide_complete_event)
+                    yield slide_complete_event
+
+                    # Update progress
+                    completed = idx + 1
+                    progress = 10.0 + completed / total_slides * 85.0
+                    progress_event = SSEEvent(
+                        event=SSEEventType.RUN_PROGRESS,
+                        run_id=run_id,
+                        data={
+                            "status": RunStatus.GENERATING.value,
+                            "progress": progress,
+                            "current_slide": completed,
+                            "total_slides": total_slides,
+                            "message": f"Generated slide {completed} of {total_slides}",
+                        },
+                    )
+                    if on_event:
+                        await on_event(progress_event)
+                    yield progress_event
+            finally:
+                # Stop outstanding LLM calls if a slide failed or the client left
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
             # Build complete SlideSpec
             slidespec_dict = {
@@ -527,8 +643,7 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
             yield complete_event
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("Slide generation failed")
             error_event = SSEEvent(
                 event=SSEEventType.RUN_ERROR,
                 run_id=run_id,
@@ -566,8 +681,7 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
             key_points = section.get("key_points", [])
 
             # Alternate section header backgrounds
-            section_backgrounds = ["gradient-accent", "gradient-dark", "gradient-ocean", "gradient-purple"]
-            section_bg = section_backgrounds[section_idx % len(section_backgrounds)]
+            section_bg = SECTION_BACKGROUNDS[section_idx % len(SECTION_BACKGROUNDS)]
 
             # Section header slide
             slides.append({
@@ -579,12 +693,13 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
             })
 
             # Content slides for this section
-            points_per_slide = max(1, len(key_points) // max(1, section_slides - 1)) if section_slides > 1 else len(key_points)
-            for i in range(max(0, section_slides - 1)):
+            content_slides = max(0, section_slides - 1)
+            points_per_slide = max(1, len(key_points) // content_slides) if content_slides else len(key_points)
+            content_title = f"{section_title} - Details" if section_slides > 2 else section_title
+            for i in range(content_slides):
                 content_slide_count += 1
                 start = i * points_per_slide
-                end = start + points_per_slide
-                slide_points = key_points[start:end] if key_points else []
+                slide_points = key_points[start:start + points_per_slide]
 
                 # Suggest varied layouts based on content and position
                 suggested_layout = "one_column"
@@ -602,7 +717,7 @@ Use gradient backgrounds for title/section/closing slides, and vary styles for c
 
                 slides.append({
                     "type": "content",
-                    "title": f"{section_title} - Details" if section_slides > 2 else section_title,
+                    "title": content_title,
                     "key_points": slide_points or [f"Details for {section_title}"],
                     "suggested_layout": suggested_layout,
                     "suggested_style": suggested_style,
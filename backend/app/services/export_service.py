@@ -1,8 +1,13 @@
 """Export Service - Converts HTML/SlideSpec to PPTX and DOCX."""
 
+import asyncio
 import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Optional
+
+import orjson
 
 from bs4 import BeautifulSoup
 from pptx import Presentation
@@ -14,8 +19,11 @@ from docx import Document
 from docx.shared import Inches as DocxInches, Pt as DocxPt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+from app.config import get_settings
 from app.schemas.slidespec import SlideSpec, Slide, Element
 
+logger = logging.getLogger(__name__)
+
 
 class PPTXExporter:
     """Exports SlideSpec/HTML to PPTX format."""
@@ -53,16 +61,18 @@ class PPTXExporter:
 
     def export_slidespec(self, slidespec: SlideSpec) -> bytes:
         """Export SlideSpec to PPTX bytes."""
+        buffer = io.BytesIO()
+        self.write_slidespec(slidespec, buffer)
+        return buffer.getvalue()
+
+    def write_slidespec(self, slidespec: SlideSpec, sink: BinaryIO):
+        """Export SlideSpec as PPTX into a writable binary file."""
         prs = self.create_presentation()
 
         for slide_data in slidespec.slides:
             self._add_slide(prs, slide_data)
 
-        # Save to bytes
-        buffer = io.BytesIO()
-        prs.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
+        prs.save(sink)
 
     def _add_slide(self, prs: Presentation, slide: Slide):
         """Add a slide to the presentation."""
@@ -70,7 +80,7 @@ class PPTXExporter:
         blank_layout = prs.slide_layouts[6]  # Blank
         ppt_slide = prs.slides.add_slide(blank_layout)
 
-        layout_id = slide.layout.layout_id if slide.layout else "one_column"
+        layout_id = slide.layout["layout_id"] if slide.layout else "one_column"
 
         if layout_id == "title_center":
             self._render_title_slide(ppt_slide, slide)
@@ -377,14 +387,25 @@ class ImageBasedPPTXExporter:
             images: List of PNG image bytes, one per slide
             speaker_notes: Optional list of speaker notes for each slide
         """
+        buffer = io.BytesIO()
+        self.write_images(images, buffer, speaker_notes)
+        return buffer.getvalue()
+
+    def write_images(
+        self,
+        images: list[bytes | str],
+        sink: BinaryIO,
+        speaker_notes: list[str] | None = None,
+    ):
+        """Export PNG images (bytes or file paths) as PPTX into a writable binary file."""
         prs = self.create_presentation()
         blank_layout = prs.slide_layouts[6]  # Blank layout
 
-        for idx, image_bytes in enumerate(images):
+        for idx, image in enumerate(images):
             slide = prs.slides.add_slide(blank_layout)
 
-            # Add image as background (full slide)
-            image_stream = io.BytesIO(image_bytes)
+            # Add image as background (full slide); python-pptx reads paths itself
+            image_stream = io.BytesIO(image) if isinstance(image, bytes) else image
             left = Inches(0)
             top = Inches(0)
             width = self.SLIDE_WIDTH
@@ -397,11 +418,7 @@ class ImageBasedPPTXExporter:
                 notes_slide = slide.notes_slide
                 notes_slide.notes_text_frame.text = speaker_notes[idx]
 
-        # Save to bytes
-        buffer = io.BytesIO()
-        prs.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
+        prs.save(sink)
 
 
 class DOCXExporter:
@@ -413,6 +430,12 @@ class DOCXExporter:
 
     def export_slidespec(self, slidespec: SlideSpec) -> bytes:
         """Export SlideSpec to DOCX bytes (as a document outline)."""
+        buffer = io.BytesIO()
+        self.write_slidespec(slidespec, buffer)
+        return buffer.getvalue()
+
+    def write_slidespec(self, slidespec: SlideSpec, sink: BinaryIO):
+        """Export SlideSpec as DOCX into a writable binary file."""
         doc = Document()
 
         # Title
@@ -425,11 +448,7 @@ class DOCXExporter:
         for slide in slidespec.slides:
             self._add_slide_section(doc, slide)
 
-        # Save to bytes
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
+        doc.save(sink)
 
     def _add_slide_section(self, doc: Document, slide: Slide):
         """Add a slide as a document section."""
@@ -489,6 +508,27 @@ class DOCXExporter:
                 table.rows[i + 1].cells[j].text = str(value) if value else ""
 
 
+# Process-pool tasks. Document packing (python-pptx/python-docx) is CPU-bound
+# and holds the GIL, so it runs in worker processes; inputs must be picklable.
+
+def _write_image_pptx(images: list[bytes | str], speaker_notes: list[str] | None, path: str):
+    """Write an image-based PPTX to path."""
+    with open(path, "wb") as f:
+        ImageBasedPPTXExporter().write_images(images, f, speaker_notes)
+
+
+def _write_pptx(slidespec_json: str | bytes, path: str):
+    """Write an element-based PPTX for a (validated) SlideSpec JSON document to path."""
+    with open(path, "wb") as f:
+        PPTXExporter().write_slidespec(SlideSpec.fast_rehydrate(orjson.loads(slidespec_json)), f)
+
+
+def _write_docx(slidespec_json: str | bytes, path: str):
+    """Write a DOCX for a (validated) SlideSpec JSON document to path."""
+    with open(path, "wb") as f:
+        DOCXExporter().write_slidespec(SlideSpec.fast_rehydrate(orjson.loads(slidespec_json)), f)
+
+
 class ExportService:
     """Unified export service for PPTX and DOCX."""
 
@@ -497,39 +537,45 @@ class ExportService:
         self.image_pptx_exporter = ImageBasedPPTXExporter()
         self.docx_exporter = DOCXExporter()
 
-    def export_to_pptx(self, slidespec: SlideSpec) -> bytes:
-        """Export SlideSpec to PPTX (element-based, legacy)."""
-        return self.pptx_exporter.export_slidespec(slidespec)
+    async def _run_in_process(self, func, *args):
+        """Run a picklable task in the export process pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_export_pool(), func, *args)
 
-    async def export_to_pptx_as_images(self, slidespec: SlideSpec) -> bytes:
-        """Export SlideSpec to PPTX as images (pixel-perfect rendering).
+    async def write_images_pptx_to_path(
+        self, images: list[bytes | str], path: Path, speaker_notes: list[str] | None = None
+    ):
+        """Write PNG slide images (bytes or file paths) as a PPTX file at path, off the event loop."""
+        await self._run_in_process(_write_image_pptx, images, speaker_notes, str(path))
+
+    async def export_to_pptx_as_images_path(self, slidespec: SlideSpec, path: Path):
+        """Export SlideSpec to an image-based PPTX file at path.
 
-        This captures each slide as an image and embeds them into PPTX,
-        ensuring the output looks exactly like the HTML preview.
         Falls back to legacy export if Playwright fails.
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
         try:
             from app.services.html_capture_service import get_html_capture_service
             capture_service = get_html_capture_service()
 
-            # Capture all slides as images
             images = await capture_service.capture_slidespec(slidespec)
-
-            # Collect speaker notes
-            speaker_notes = [
-                slide.speaker_notes for slide in slidespec.slides
-            ]
-
-            # Create PPTX from images
-            return self.image_pptx_exporter.export_from_images(images, speaker_notes)
+            speaker_notes = [slide.speaker_notes for slide in slidespec.slides]
+            await self.write_images_pptx_to_path(images, path, speaker_notes)
 
         except Exception as e:
             logger.warning(f"Image-based PPTX export failed: {e}. Falling back to legacy export.")
-            # Fallback to legacy element-based export
-            return self.export_to_pptx(slidespec)
+            await self._run_in_process(_write_pptx, slidespec.model_dump_json(), str(path))
+
+    async def export_to_docx_path(self, slidespec_json: str | bytes, path: Path):
+        """Export a SlideSpec JSON document to a DOCX file at path, off the event loop.
+
+        The document comes from storage and was validated when saved, so workers
+        rebuild it with SlideSpec.fast_rehydrate instead of validating it again.
+        """
+        await self._run_in_process(_write_docx, slidespec_json, str(path))
+
+    def export_to_pptx(self, slidespec: SlideSpec) -> bytes:
+        """Export SlideSpec to PPTX (element-based, legacy)."""
+        return self.pptx_exporter.export_slidespec(slidespec)
 
     async def export_html_slides_to_pptx(self, html_slides: list[str], speaker_notes: list[str] | None = None) -> bytes:
         """Export HTML slides to PPTX as images.
@@ -566,3 +612,35 @@ class ExportService:
         if slidespec:
             return self.export_to_docx(slidespec)
         raise NotImplementedError("HTML-only export not yet implemented")
+
+
+# Singleton instance
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """Get the export service singleton."""
+    global _export_service
+    if _export_service is None:
+        _export_service = ExportService()
+    return _export_service
+
+
+# Process pool for document packing, created on first use
+_export_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_export_pool() -> ProcessPoolExecutor:
+    """Get the export process pool singleton."""
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = ProcessPoolExecutor(max_workers=get_settings().export_processes)
+    return _export_pool
+
+
+def shutdown_export_pool():
+    """Shut down the export process pool, if it was started."""
+    global _export_pool
+    if _export_pool is not None:
+        _export_pool.shutdown(cancel_futures=True)
+        _export_pool = None
@@ -5,44 +5,62 @@ import sys
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from app.renderers.html_slide_renderer import HTMLSlideRenderer
+from app.config import get_settings
+from app.renderers.html_slide_renderer import get_html_slide_renderer
 from app.schemas.slidespec import SlideSpec
 
 
+class _CaptureWorker:
+    """A Playwright browser bound to its own thread (sync API objects are thread-affine)."""
+
+    def __init__(self):
+        self.browser = None
+        self.playwright = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def ensure_browser_sync(self):
+        """Ensure browser is initialized (sync version, call from the worker thread)."""
+        if self.browser is None:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=True)
+        return self.browser
+
+    def close_sync(self):
+        """Close browser resources (sync version, call from the worker thread)."""
+        if self.browser:
+            self.browser.close()
+            self.browser = None
+        if self.playwright:
+            self.playwright.stop()
+            self.playwright = None
+
+    async def run(self, func, *args):
+        """Run a function on this worker's thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+
 class HTMLCaptureService:
-    """Captures HTML slides as images using Playwright (sync API for Windows compatibility)."""
+    """Captures HTML slides as images using Playwright (sync API for Windows compatibility).
+
+    Captures run on a pool of `concurrency` browsers, each on its own thread.
+    """
 
     # Slide dimensions (16:9 at 2x for quality)
     SLIDE_WIDTH = 1920
     SLIDE_HEIGHT = 1080
 
-    def __init__(self):
-        self._browser = None
-        self._playwright = None
-        self._executor = ThreadPoolExecutor(max_workers=1)
-        self.renderer = HTMLSlideRenderer()
-
-    def _ensure_browser_sync(self):
-        """Ensure browser is initialized (sync version)."""
-        if self._browser is None:
-            from playwright.sync_api import sync_playwright
-            self._playwright = sync_playwright().start()
-            self._browser = self._playwright.chromium.launch(headless=True)
-        return self._browser
-
-    def close_sync(self):
-        """Close browser resources (sync version)."""
-        if self._browser:
-            self._browser.close()
-            self._browser = None
-        if self._playwright:
-            self._playwright.stop()
-            self._playwright = None
+    def __init__(self, concurrency: int = 1):
+        self._workers = [_CaptureWorker() for _ in range(max(concurrency, 1))]
+        self._idle: asyncio.Queue[_CaptureWorker] = asyncio.Queue()
+        for worker in self._workers:
+            self._idle.put_nowait(worker)
+        self.renderer = get_html_slide_renderer()
 
     async def close(self):
         """Close browser resources."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(self._executor, self.close_sync)
+        await asyncio.gather(*(worker.run(worker.close_sync) for worker in self._workers))
 
     def _get_full_html(self, slide_html: str) -> str:
         """Wrap slide HTML with full document including Tailwind CSS and Chart.js."""
@@ -230,9 +248,9 @@ if (document.readyState === 'loading') {{
 </body>
 </html>"""
 
-    def _capture_slide_html_sync(self, slide_html: str) -> bytes:
-        """Capture a slide HTML as PNG image bytes (sync version)."""
-        browser = self._ensure_browser_sync()
+    def _capture_slide_html_sync(self, worker: _CaptureWorker, slide_html: str) -> bytes:
+        """Capture a slide HTML as PNG image bytes (sync version, on the worker thread)."""
+        browser = worker.ensure_browser_sync()
         page = browser.new_page(viewport={'width': self.SLIDE_WIDTH, 'height': self.SLIDE_HEIGHT})
 
         try:
@@ -272,52 +290,26 @@ if (document.readyState === 'loading') {{
             page.close()
 
     async def capture_slide_html(self, slide_html: str) -> bytes:
-        """Capture a slide HTML as PNG image bytes."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self._capture_slide_html_sync,
-            slide_html
-        )
-
-    def _capture_slidespec_sync(self, slidespec: SlideSpec) -> list[bytes]:
-        """Capture all slides from a SlideSpec as PNG images (sync version)."""
-        images = []
-
-        for idx, slide in enumerate(slidespec.slides):
-            # Render slide to HTML
-            html = self.renderer.render_slide(slide, idx)
-            # Capture as image
-            image_bytes = self._capture_slide_html_sync(html)
-            images.append(image_bytes)
-
-        return images
+        """Capture a slide HTML as PNG image bytes on the next idle browser."""
+        worker = await self._idle.get()
+        try:
+            return await worker.run(self._capture_slide_html_sync, worker, slide_html)
+        finally:
+            self._idle.put_nowait(worker)
 
     async def capture_slidespec(self, slidespec: SlideSpec) -> list[bytes]:
         """Capture all slides from a SlideSpec as PNG images."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self._capture_slidespec_sync,
-            slidespec
-        )
-
-    def _capture_html_slides_sync(self, html_slides: list[str]) -> list[bytes]:
-        """Capture multiple HTML slides as PNG images (sync version)."""
-        images = []
-        for html in html_slides:
-            image_bytes = self._capture_slide_html_sync(html)
-            images.append(image_bytes)
-        return images
+        deck_context = self.renderer.prepare_deck_context(slidespec.style)
+        # Render on worker threads so a large deck doesn't block the event loop
+        html_slides = await asyncio.gather(*(
+            asyncio.to_thread(self.renderer.render_slide, slide, idx, deck_context=deck_context)
+            for idx, slide in enumerate(slidespec.slides)
+        ))
+        return await self.capture_html_slides(html_slides)
 
     async def capture_html_slides(self, html_slides: list[str]) -> list[bytes]:
-        """Capture multiple HTML slides as PNG images."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self._capture_html_slides_sync,
-            html_slides
-        )
+        """Capture multiple HTML slides as PNG images, in parallel across the pool."""
+        return list(await asyncio.gather(*(self.capture_slide_html(html) for html in html_slides)))
 
 
 # Singleton instance
@@ -328,5 +320,5 @@ def get_html_capture_service() -> HTMLCaptureService:
     """Get the HTML capture service singleton."""
     global _capture_service
     if _capture_service is None:
-        _capture_service = HTMLCaptureService()
+        _capture_service = HTMLCaptureService(concurrency=get_settings().capture_concurrency)
     return _capture_service
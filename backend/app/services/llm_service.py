@@ -1,12 +1,61 @@
 """LLM Service - Unified interface for Claude and OpenAI APIs."""
 
+import asyncio
 import json
+import time
+import weakref
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import AsyncGenerator, Literal
 
 from app.config import get_settings
 
 
+class TokenBucket:
+    """Async token bucket: `rate` acquisitions per `period` seconds, bursting up to `rate`.
+
+    Waiters are served in arrival order, so a burst of concurrent calls is
+    spread out instead of all hitting the provider's rate limit at once. The
+    bucket is shared process-wide, so each event loop waits on its own lock
+    (an asyncio.Lock is bound to the loop that first waits on it).
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = rate
+        self._tokens = float(rate)
+        self._fill_rate = rate / period
+        self._updated = time.monotonic()
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _loop_lock(self) -> asyncio.Lock:
+        """The running loop's lock, created on first use."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made."""
+        async with self._loop_lock():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+
+@lru_cache
+def _rate_limiter(provider: str, requests_per_minute: int) -> TokenBucket:
+    """Process-wide limiter per provider (rate limits apply per API key)."""
+    return TokenBucket(requests_per_minute)
+
+
 class BaseLLMProvider(ABC):
     """Base class for LLM providers."""
 
@@ -26,16 +75,17 @@ class BaseLLMProvider(ABC):
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude API provider."""
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
+    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", max_retries: int = 2):
         self.api_key = api_key
         self.model = model
+        self.max_retries = max_retries
         self._client = None
 
     @property
     def client(self):
         if self._client is None:
             import anthropic
-            self._client = anthropic.AsyncAnthropic(api_key=self.api_key)
+            self._client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=self.max_retries)
         return self._client
 
     async def generate(self, prompt: str, system: str | None = None) -> str:
@@ -70,16 +120,17 @@ class AnthropicProvider(BaseLLMProvider):
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI GPT API provider."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
+    def __init__(self, api_key: str, model: str = "gpt-4o", max_retries: int = 2):
         self.api_key = api_key
         self.model = model
+        self.max_retries = max_retries
         self._client = None
 
     @property
     def client(self):
         if self._client is None:
             from openai import AsyncOpenAI
-            self._client = AsyncOpenAI(api_key=self.api_key)
+            self._client = AsyncOpenAI(api_key=self.api_key, max_retries=self.max_retries)
         return self._client
 
     async def generate(self, prompt: str, system: str | None = None) -> str:
@@ -134,26 +185,40 @@ class LLMService:
             mdl = model or settings.anthropic_model
             if not key:
                 raise ValueError("Anthropic API key not configured")
-            self._provider = AnthropicProvider(key, mdl)
+            self._provider = AnthropicProvider(key, mdl, settings.llm_max_retries)
         elif provider == "openai":
             key = api_key or settings.openai_api_key
             mdl = model or settings.openai_model
             if not key:
                 raise ValueError("OpenAI API key not configured")
-            self._provider = OpenAIProvider(key, mdl)
+            self._provider = OpenAIProvider(key, mdl, settings.llm_max_retries)
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
         self.provider_name = provider
+        self._limiter = (
+            _rate_limiter(provider, settings.llm_requests_per_minute)
+            if settings.llm_requests_per_minute
+            else None
+        )
+
+    @property
+    def model(self) -> str:
+        """Model name used by the provider."""
+        return self._provider.model
 
     async def generate(self, prompt: str, system: str | None = None) -> str:
         """Generate a response."""
+        if self._limiter is not None:
+            await self._limiter.acquire()
         return await self._provider.generate(prompt, system)
 
     async def generate_stream(
         self, prompt: str, system: str | None = None
     ) -> AsyncGenerator[str, None]:
         """Generate a streaming response."""
+        if self._limiter is not None:
+            await self._limiter.acquire()
         async for chunk in self._provider.generate_stream(prompt, system):
             yield chunk
 
@@ -162,21 +227,7 @@ class LLMService:
     ) -> dict:
         """Generate a JSON response (extracts JSON from the response)."""
         response = await self.generate(prompt, system)
-
-        # Try to extract JSON from the response
-        # Handle cases where model might wrap JSON in markdown code blocks
-        text = response.strip()
-
-        # Remove markdown code blocks if present
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-
-        if text.endswith("```"):
-            text = text[:-3]
-
-        text = text.strip()
+        text = self._strip_code_fence(response)
 
         try:
             return json.loads(text)
@@ -191,6 +242,40 @@ class LLMService:
                     pass
             raise ValueError(f"Failed to parse JSON from response: {e}")
 
+    async def generate_json_text(
+        self, prompt: str, system: str | None = None
+    ) -> str:
+        """Generate a response and return the JSON object text in it, unparsed.
+
+        For callers that validate with pydantic's model_validate_json, which
+        parses and validates in one pass without building a dict first.
+        """
+        response = await self.generate(prompt, system)
+        text = self._strip_code_fence(response)
+
+        # Trim any prose around the object
+        start = text.find("{")
+        end = text.rfind("}") + 1
+        if start == -1 or end <= start:
+            raise ValueError("No JSON object found in response")
+        return text[start:end]
+
+    @staticmethod
+    def _strip_code_fence(response: str) -> str:
+        """Strip a markdown code block the model may wrap JSON in."""
+        text = response.strip()
+
+        # Remove markdown code blocks if present
+        if text.startswith("```json"):
+            text = text[7:]
+        elif text.startswith("```"):
+            text = text[3:]
+
+        if text.endswith("```"):
+            text = text[:-3]
+
+        return text.strip()
+
 
 def get_llm_service(
     provider: Literal["anthropic", "openai"] | None = None
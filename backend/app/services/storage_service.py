@@ -1,26 +1,50 @@
 """Storage Service - Persistent storage for runs and artifacts."""
 
+import asyncio
+import hashlib
+import itertools
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import logging
 
+import orjson
+
+from app.cache import LRUCache
+from app.schemas.run import RunState
+
 logger = logging.getLogger(__name__)
 
 
 class StorageService:
     """Handles persistent storage for runs and slidespecs."""
 
-    def __init__(self, storage_dir: str = None):
+    def __init__(
+        self,
+        storage_dir: str = None,
+        max_cached_runs: int = None,
+        max_cached_slidespecs: int = None,
+    ):
         """Initialize storage service.
 
         Args:
             storage_dir: Directory for storing data. Defaults to ./data
+            max_cached_runs: Runs kept in memory; older ones are re-read from
+                disk on demand. Defaults to 1000
+            max_cached_slidespecs: Slidespecs kept in memory, likewise.
+                Defaults to 256
         """
         if storage_dir is None:
             storage_dir = os.getenv("STORAGE_DIR", "./data")
+        if max_cached_runs is None:
+            max_cached_runs = int(os.getenv("MAX_CACHED_RUNS", "1000"))
+        if max_cached_slidespecs is None:
+            max_cached_slidespecs = int(os.getenv("MAX_CACHED_SLIDESPECS", "256"))
 
         self.storage_dir = Path(storage_dir)
         self.runs_dir = self.storage_dir / "runs"
@@ -30,36 +54,71 @@ class StorageService:
         self.runs_dir.mkdir(parents=True, exist_ok=True)
         self.slidespecs_dir.mkdir(parents=True, exist_ok=True)
 
-        # In-memory cache
-        self._runs_cache: dict[str, dict] = {}
-        self._slidespecs_cache: dict[str, dict] = {}
+        # In-memory caches. Runs and slidespecs are bounded (evicted ones are
+        # reloaded from disk) while every run id is kept in creation order for
+        # listing, and every slidespec keeps its metadata.
+        self._runs_cache: LRUCache[str, dict] = LRUCache(maxsize=max_cached_runs)
+        self._run_ids: OrderedDict[str, None] = OrderedDict()
+        self._slidespecs_cache: LRUCache[str, dict] = LRUCache(maxsize=max_cached_slidespecs)
+
+        # Write versions, bumped on every slidespec save/delete so that
+        # derived caches can tell when their entries are stale. Seeded from
+        # the clock so versions don't repeat across restarts (the on-disk
+        # export cache outlives the process).
+        self._version_counter = itertools.count(time.time_ns() // 1000)
+        self._slidespec_versions: dict[str, int] = {}
+        # Serialized JSON of each slidespec as (version, bytes), built on demand
+        self._slidespec_bytes: LRUCache[str, tuple[int, bytes]] = LRUCache(maxsize=max_cached_slidespecs)
+        # Content hash of each slidespec as (version, hex digest), built on demand
+        self._slidespec_etags: dict[str, tuple[int, str]] = {}
+        # Latest version drawn for any slidespec; changes on every write or delete
+        self._catalog_version = 0
+
+        # Per-artifact summary (title, slide count, ...) kept in sync on every save
+        self._slidespec_metadata: dict[str, dict] = {}
+        # Per-slide summaries (index, slide_id, type, layout, title) per artifact
+        self._slide_summaries: dict[str, list[dict]] = {}
+
+        # Slidespecs saved in memory but not yet written to disk (write-behind);
+        # held here too so that cache eviction can't drop an unflushed edit
+        self._dirty_slidespecs: dict[str, dict] = {}
+        self._write_lock = threading.Lock()
+
+        # Per artifact: slide_index -> element_id -> element dict, tagged with
+        # the elements list (and its length) it was built from. Rebuilt for the
+        # edited slide on every save, and lazily for any other slide.
+        self._element_indexes: LRUCache[str, dict[int, tuple[list, int, dict[str, dict]]]] = (
+            LRUCache(maxsize=max_cached_slidespecs)
+        )
 
         # Load existing data
         self._load_all()
 
     def _load_all(self):
         """Load all existing data from storage."""
-        # Load runs
+        # Load runs, oldest first so the newest stay cached
+        runs = []
         for file_path in self.runs_dir.glob("*.json"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    run_id = file_path.stem
-                    self._runs_cache[run_id] = data
-            except Exception as e:
-                logger.error(f"Failed to load run {file_path}: {e}")
+            data = self._read_run_file(file_path)
+            if data is not None:
+                runs.append((file_path.stem, data))
+        runs.sort(key=lambda item: item[1].get("created_at", ""))
+        for run_id, data in runs:
+            self._run_ids[run_id] = None
+            self._runs_cache.set(run_id, data)
 
         # Load slidespecs
         for file_path in self.slidespecs_dir.glob("*.json"):
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    artifact_id = file_path.stem
-                    self._slidespecs_cache[artifact_id] = data
+                data = orjson.loads(file_path.read_bytes())
+                artifact_id = file_path.stem
+                self._slidespecs_cache.set(artifact_id, data)
+                self._bump_slidespec_version(artifact_id)
+                self._update_slidespec_metadata(artifact_id, data)
             except Exception as e:
                 logger.error(f"Failed to load slidespec {file_path}: {e}")
 
-        logger.info(f"Loaded {len(self._runs_cache)} runs and {len(self._slidespecs_cache)} slidespecs from storage")
+        logger.info(f"Loaded {len(self._run_ids)} runs and {len(self._slidespec_metadata)} slidespecs from storage")
 
     def _datetime_handler(self, obj):
         """JSON serializer for datetime objects."""
@@ -69,13 +128,22 @@ class StorageService:
 
     # === Run Operations ===
 
-    def save_run(self, run_id: str, run_data: dict) -> bool:
-        """Save a run to storage."""
+    def save_run(self, run_id: str, run_data: dict | RunState, persist: bool = True) -> bool:
+        """Save a run to storage.
+
+        With persist=False only the in-memory copy is updated (for frequent
+        progress updates; the next persisted save writes everything).
+        """
+        if isinstance(run_data, RunState):
+            run_data = run_data.to_dict()
         try:
-            file_path = self.runs_dir / f"{run_id}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(run_data, f, default=self._datetime_handler, ensure_ascii=False, indent=2)
-            self._runs_cache[run_id] = run_data
+            if persist:
+                file_path = self.runs_dir / f"{run_id}.json"
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump(run_data, f, default=self._datetime_handler, ensure_ascii=False, indent=2)
+            self._runs_cache.set(run_id, run_data)
+            # New runs go last; updates keep their creation-order position
+            self._run_ids.setdefault(run_id, None)
             return True
         except Exception as e:
             logger.error(f"Failed to save run {run_id}: {e}")
@@ -83,7 +151,21 @@ class StorageService:
 
     def get_run(self, run_id: str) -> Optional[dict]:
         """Get a run from storage."""
-        return self._runs_cache.get(run_id)
+        run_data = self._runs_cache.get(run_id)
+        if run_data is None and run_id in self._run_ids:
+            run_data = self._read_run_file(self.runs_dir / f"{run_id}.json")
+            if run_data is not None:
+                self._runs_cache.set(run_id, run_data)
+        return run_data
+
+    def _read_run_file(self, file_path: Path) -> Optional[dict]:
+        """Read a run from its JSON file."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load run {file_path}: {e}")
+            return None
 
     def delete_run(self, run_id: str) -> bool:
         """Delete a run from storage."""
@@ -91,78 +173,322 @@ class StorageService:
             file_path = self.runs_dir / f"{run_id}.json"
             if file_path.exists():
                 file_path.unlink()
-            if run_id in self._runs_cache:
-                del self._runs_cache[run_id]
+            self._runs_cache.pop(run_id)
+            self._run_ids.pop(run_id, None)
             return True
         except Exception as e:
             logger.error(f"Failed to delete run {run_id}: {e}")
             return False
 
     def list_runs(self, limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
-        """List all runs with pagination."""
-        runs = list(self._runs_cache.values())
-        # Sort by created_at descending
-        runs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        total = len(runs)
-        return runs[offset:offset + limit], total
-
-    def get_all_runs(self) -> dict[str, dict]:
-        """Get all runs (for internal use)."""
-        return self._runs_cache
+        """List all runs with pagination, newest first."""
+        # Run ids are kept in creation order, so only the page is touched
+        page_ids = itertools.islice(reversed(self._run_ids), offset, offset + limit)
+        runs = [run for run in map(self.get_run, page_ids) if run is not None]
+        return runs, len(self._run_ids)
 
     # === Slidespec Operations ===
 
-    def save_slidespec(self, artifact_id: str, slidespec: dict) -> bool:
-        """Save a slidespec to storage."""
+    def save_slidespec(
+        self, artifact_id: str, slidespec: dict, changed_slide: int | None = None
+    ) -> bool:
+        """Save a slidespec to storage.
+
+        changed_slide names the only slide that changed, if known, so that
+        just its summary is recomputed.
+        """
+        # Callers may have mutated the cached dict in place already, so
+        # invalidate derived caches even if the write below fails.
+        self._bump_slidespec_version(artifact_id)
+        self._update_slidespec_metadata(artifact_id, slidespec, changed_slide)
+        self._reindex_elements(artifact_id, slidespec, changed_slide)
+        self._dirty_slidespecs.pop(artifact_id, None)
         try:
             file_path = self.slidespecs_dir / f"{artifact_id}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(slidespec, f, ensure_ascii=False, indent=2)
-            self._slidespecs_cache[artifact_id] = slidespec
+            # Compact orjson output: still plain JSON, but much faster to write
+            data = orjson.dumps(slidespec)
+            with self._write_lock, open(file_path, "wb") as f:
+                f.write(data)
+            self._slidespecs_cache.set(artifact_id, slidespec)
+            self._slidespec_bytes.set(artifact_id, (self.get_slidespec_version(artifact_id), data))
             return True
         except Exception as e:
             logger.error(f"Failed to save slidespec {artifact_id}: {e}")
             return False
 
+    async def save_slidespec_async(
+        self, artifact_id: str, slidespec: dict, changed_slide: int | None = None
+    ) -> bool:
+        """Save a slidespec like save_slidespec, writing the file on a worker thread.
+
+        Bookkeeping and serialization stay on the event loop (see
+        flush_slidespecs); a failed write is queued for the next flush.
+        """
+        self._bump_slidespec_version(artifact_id)
+        self._update_slidespec_metadata(artifact_id, slidespec, changed_slide)
+        self._reindex_elements(artifact_id, slidespec, changed_slide)
+        self._dirty_slidespecs.pop(artifact_id, None)
+        self._slidespecs_cache.set(artifact_id, slidespec)
+        data = self._serialize_slidespec(artifact_id, slidespec)
+        version = self.get_slidespec_version(artifact_id)
+        try:
+            await asyncio.to_thread(self._write_slidespec_file, artifact_id, data, version)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save slidespec {artifact_id}: {e}")
+            if self.get_slidespec_version(artifact_id) == version:
+                self._dirty_slidespecs[artifact_id] = slidespec
+            return False
+
+    def save_slidespec_deferred(
+        self, artifact_id: str, slidespec: dict, changed_slide: int | None = None
+    ):
+        """Save a slidespec in memory and queue it for the next background flush."""
+        self._bump_slidespec_version(artifact_id)
+        self._update_slidespec_metadata(artifact_id, slidespec, changed_slide)
+        self._reindex_elements(artifact_id, slidespec, changed_slide)
+        self._slidespecs_cache.set(artifact_id, slidespec)
+        self._dirty_slidespecs[artifact_id] = slidespec
+
+    def _write_slidespec_file(self, artifact_id: str, data: bytes, version: int) -> None:
+        """Write a serialized slidespec unless a newer save/delete superseded it."""
+        with self._write_lock:
+            if self._slidespec_versions.get(artifact_id) != version:
+                return
+            file_path = self.slidespecs_dir / f"{artifact_id}.json"
+            with open(file_path, "wb") as f:
+                f.write(data)
+
+    async def flush_slidespecs(self):
+        """Write all queued slidespecs to disk."""
+        for artifact_id, slidespec in list(self._dirty_slidespecs.items()):
+            # Serialize on the event loop so handlers can't mutate the dict mid-dump
+            data = self._serialize_slidespec(artifact_id, slidespec)
+            version = self.get_slidespec_version(artifact_id)
+            try:
+                await asyncio.to_thread(self._write_slidespec_file, artifact_id, data, version)
+            except Exception as e:
+                logger.error(f"Failed to flush slidespec {artifact_id}: {e}")
+                continue
+            # Stay pinned if it was saved again while the write was in flight
+            if self.get_slidespec_version(artifact_id) == version:
+                self._dirty_slidespecs.pop(artifact_id, None)
+
+    async def flush_periodically(self, interval: float):
+        """Background task flushing deferred slidespec saves every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush_slidespecs()
+
     def get_slidespec(self, artifact_id: str) -> Optional[dict]:
-        """Get a slidespec from storage."""
-        return self._slidespecs_cache.get(artifact_id)
+        """Get a slidespec from storage, reloading it from disk if it was evicted."""
+        slidespec = self._slidespecs_cache.get(artifact_id)
+        if slidespec is not None:
+            return slidespec
+
+        slidespec = self._dirty_slidespecs.get(artifact_id)
+        # Only known artifacts go to disk, so unknown ids stay cheap 404s
+        if slidespec is None and artifact_id in self._slidespec_metadata:
+            slidespec = self._read_slidespec_file(artifact_id)
+        if slidespec is not None:
+            self._slidespecs_cache.set(artifact_id, slidespec)
+        return slidespec
+
+    def _read_slidespec_file(self, artifact_id: str) -> Optional[dict]:
+        """Read a slidespec file, or None if it is missing or unreadable."""
+        file_path = self.slidespecs_dir / f"{artifact_id}.json"
+        try:
+            return orjson.loads(file_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load slidespec {file_path}: {e}")
+            return None
+
+    def get_slidespec_bytes(self, artifact_id: str) -> Optional[bytes]:
+        """Get a slidespec serialized as compact JSON, reused until the next write."""
+        slidespec = self.get_slidespec(artifact_id)
+        if slidespec is None:
+            return None
+        return self._serialize_slidespec(artifact_id, slidespec)
+
+    def _serialize_slidespec(self, artifact_id: str, slidespec: dict) -> bytes:
+        """Serialize a slidespec, reusing the cached bytes for its current version."""
+        version = self.get_slidespec_version(artifact_id)
+        cached = self._slidespec_bytes.get(artifact_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        data = orjson.dumps(slidespec)
+        self._slidespec_bytes.set(artifact_id, (version, data))
+        return data
+
+    def get_slidespec_etag(self, artifact_id: str) -> Optional[str]:
+        """Get a content hash of a slidespec, recomputed only after a write."""
+        version = self.get_slidespec_version(artifact_id)
+        cached = self._slidespec_etags.get(artifact_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        data = self.get_slidespec_bytes(artifact_id)
+        if data is None:
+            return None
+        etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+        self._slidespec_etags[artifact_id] = (version, etag)
+        return etag
 
     def delete_slidespec(self, artifact_id: str) -> bool:
         """Delete a slidespec from storage."""
+        self._dirty_slidespecs.pop(artifact_id, None)
         try:
             file_path = self.slidespecs_dir / f"{artifact_id}.json"
-            if file_path.exists():
-                file_path.unlink()
-            if artifact_id in self._slidespecs_cache:
-                del self._slidespecs_cache[artifact_id]
+            # Under the write lock, so a flush already past its version check
+            # can't recreate the file after the unlink
+            with self._write_lock:
+                self._bump_slidespec_version(artifact_id)
+                file_path.unlink(missing_ok=True)
+            self._slidespecs_cache.pop(artifact_id)
+            self._slidespec_metadata.pop(artifact_id, None)
+            self._slidespec_bytes.pop(artifact_id, None)
+            self._slidespec_etags.pop(artifact_id, None)
+            self._slide_summaries.pop(artifact_id, None)
+            self._element_indexes.pop(artifact_id)
             return True
         except Exception as e:
             logger.error(f"Failed to delete slidespec {artifact_id}: {e}")
             return False
 
+    def get_slidespec_version(self, artifact_id: str) -> int:
+        """Get the write version of a slidespec (changes on every save/delete)."""
+        return self._slidespec_versions.get(artifact_id, 0)
+
+    def _bump_slidespec_version(self, artifact_id: str):
+        """Assign a new, process-unique write version to a slidespec."""
+        version = next(self._version_counter)
+        self._slidespec_versions[artifact_id] = version
+        self._catalog_version = version
+
+    def get_catalog_version(self) -> int:
+        """Get a version that changes whenever any slidespec is saved or deleted."""
+        return self._catalog_version
+
+    def get_slidespec_metadata(self, artifact_id: str) -> Optional[dict]:
+        """Get the precomputed summary of a slidespec (artifact_id, title, slide_count, created_at)."""
+        return self._slidespec_metadata.get(artifact_id)
+
+    def get_slide_summaries(self, artifact_id: str) -> list[dict]:
+        """Get the precomputed summary of each slide in a slidespec."""
+        return self._slide_summaries.get(artifact_id, [])
+
+    def _update_slidespec_metadata(
+        self, artifact_id: str, slidespec: dict, changed_slide: int | None = None
+    ):
+        """Recompute the summary and slide summaries of a slidespec after a save."""
+        slides = slidespec.get("slides", [])
+        self._slidespec_metadata[artifact_id] = {
+            "artifact_id": artifact_id,
+            "title": slidespec.get("deck", {}).get("title", "Untitled"),
+            "slide_count": len(slides),
+            "created_at": slidespec.get("created_at"),
+        }
+
+        summaries = self._slide_summaries.get(artifact_id)
+        if changed_slide is not None and summaries is not None and len(summaries) == len(slides):
+            summaries[changed_slide] = self._summarize_slide(changed_slide, slides[changed_slide])
+        else:
+            self._slide_summaries[artifact_id] = [
+                self._summarize_slide(idx, slide) for idx, slide in enumerate(slides)
+            ]
+
+    @staticmethod
+    def _summarize_slide(idx: int, slide: dict) -> dict:
+        """Build the list_slides entry for a slide."""
+        title = next(
+            (
+                elem.get("content", {}).get("text", "")
+                for elem in slide.get("elements", ())
+                if elem.get("role") == "title" and elem.get("kind") == "text"
+            ),
+            "",
+        )
+        return {
+            "index": idx,
+            "slide_id": slide.get("slide_id", f"slide-{idx}"),
+            "type": slide.get("type", "content"),
+            "layout": (slide.get("layout") or {}).get("layout_id", "one_column"),
+            "title": title,
+        }
+
+    def get_element(self, artifact_id: str, slide_index: int, element_id: str) -> Optional[dict]:
+        """Get an element dict (the cached, mutable one) from a slide by its id."""
+        slidespec = self.get_slidespec(artifact_id)
+        if not slidespec:
+            return None
+        slides = slidespec.get("slides", [])
+        if slide_index < 0 or slide_index >= len(slides):
+            return None
+        elements = slides[slide_index].get("elements", [])
+
+        indexes = self._element_indexes.get(artifact_id)
+        cached = indexes.get(slide_index) if indexes is not None else None
+        # The index is only valid for the same list object: replacing a slide
+        # (update/regenerate) swaps the list, while element edits are in place.
+        if cached is not None and cached[0] is elements and cached[1] == len(elements):
+            element = cached[2].get(element_id)
+            if element is not None and element.get("element_id") == element_id:
+                return element
+
+        # Rebuild on miss too, since an in-place edit may have renamed an element
+        return self._index_slide_elements(artifact_id, slide_index, elements).get(element_id)
+
+    def _index_slide_elements(self, artifact_id: str, slide_index: int, elements: list) -> dict[str, dict]:
+        """Build and store the element_id -> element index of one slide."""
+        # Reversed so that the first of any duplicate ids wins
+        index = {e.get("element_id"): e for e in reversed(elements)}
+        indexes = self._element_indexes.get(artifact_id)
+        if indexes is None:
+            indexes = {}
+            self._element_indexes.set(artifact_id, indexes)
+        indexes[slide_index] = (elements, len(elements), index)
+        return index
+
+    def _reindex_elements(self, artifact_id: str, slidespec: dict, changed_slide: int | None):
+        """Refresh element indexes after a save: the edited slide now, the rest on demand."""
+        if changed_slide is None:
+            self._element_indexes.pop(artifact_id)
+            return
+        slides = slidespec.get("slides", [])
+        if 0 <= changed_slide < len(slides):
+            self._index_slide_elements(
+                artifact_id, changed_slide, slides[changed_slide].get("elements", [])
+            )
+
+    def patch_element(
+        self, artifact_id: str, slide_index: int, element_id: str, element_data: dict
+    ) -> Optional[dict]:
+        """Merge fields into one element in place and queue the slidespec for flushing.
+
+        Only the touched slide's summary is recomputed. Returns the updated
+        element, or None if the artifact, slide or element doesn't exist.
+        """
+        element = self.get_element(artifact_id, slide_index, element_id)
+        if element is None:
+            return None
+        element.update(element_data)
+        self.save_slidespec_deferred(
+            artifact_id, self.get_slidespec(artifact_id), changed_slide=slide_index
+        )
+        return element
+
     def list_slidespecs(self, limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
         """List all slidespecs with pagination."""
-        items = []
-        for artifact_id, spec in self._slidespecs_cache.items():
-            items.append({
-                "artifact_id": artifact_id,
-                "title": spec.get("deck", {}).get("title", "Untitled"),
-                "slide_count": len(spec.get("slides", [])),
-                "created_at": spec.get("created_at"),
-            })
+        items = list(self._slidespec_metadata.values())
         # Sort by title
         items.sort(key=lambda x: x.get("title", ""))
         total = len(items)
         return items[offset:offset + limit], total
 
-    def get_all_slidespecs(self) -> dict[str, dict]:
-        """Get all slidespecs (for internal use)."""
-        return self._slidespecs_cache
-
     def update_slidespec_slide(self, artifact_id: str, slide_index: int, slide_data: dict) -> bool:
         """Update a specific slide within a slidespec."""
-        slidespec = self._slidespecs_cache.get(artifact_id)
+        slidespec = self.get_slidespec(artifact_id)
         if not slidespec:
             return False
 
@@ -400,24 +400,12 @@ async function downloadPptxWithProgress() {
         const data = JSON.parse(event.data);
         eventSource.close();
 
-        // Convert base64 to blob and download
-        const binaryString = atob(data.data);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
-        }
-        const blob = new Blob([bytes], {
-            type: 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
-        });
-
-        // Trigger download
-        const url = window.URL.createObjectURL(blob);
+        // Fetch the exported file through its one-time download token
         const a = document.createElement('a');
-        a.href = url;
+        a.href = `${API_BASE}/artifacts/${currentArtifactId}/download-token/${data.download_token}`;
         a.download = data.filename;
         document.body.appendChild(a);
         a.click();
-        window.URL.revokeObjectURL(url);
         document.body.removeChild(a);
 
         updateExportProgress(data.total || 1, data.total || 1, 'Download complete!');
@@ -0,0 +1,43 @@
+"""Shared fixtures: an isolated storage directory and an app client using it."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import storage_service
+from app.services.storage_service import StorageService
+
+
+def make_slidespec(title: str = "Deck") -> dict:
+    """A small valid slidespec with one title slide and one content slide."""
+    return {
+        "schema_version": "slidespec_v1",
+        "deck": {"title": title, "language": "en"},
+        "slides": [
+            {"slide_id": "s1", "type": "title", "title": title, "elements": []},
+            {
+                "slide_id": "s2",
+                "title": "Details",
+                "elements": [
+                    {"element_id": "e1", "kind": "text", "role": "body", "content": {"text": "Hello"}},
+                ],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch) -> StorageService:
+    """A StorageService on a temp directory, installed as the app's singleton."""
+    service = StorageService(storage_dir=str(tmp_path / "data"))
+    monkeypatch.setattr(storage_service, "_storage_service", service)
+    return service
+
+
+@pytest.fixture
+def client(storage, tmp_path, monkeypatch):
+    """A TestClient running the app's lifespan, with storage_path under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,148 @@
+"""Tests for AgentService: streaming slide generation and the LLM response cache."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app.config import get_settings
+from app.schemas.run import SSEEventType
+from app.schemas.slidespec import Slide
+from app.services.agent_service import SLIDE_REPAIR_ATTEMPTS, AgentService
+
+OUTLINE = {
+    "title": "Deck",
+    "sections": [
+        {"title": "One", "slides": 3, "key_points": ["a", "b", "c", "d"]},
+        {"title": "Two", "slides": 2, "key_points": ["e", "f"]},
+    ],
+}
+
+
+class FakeAgentService(AgentService):
+    """Agent whose LLM calls finish in reverse deck order."""
+
+    def __init__(self):
+        super().__init__(llm_service=object())
+
+    async def generate_outline(self, *args, **kwargs) -> dict:
+        return OUTLINE
+
+    async def generate_single_slide(self, slide_index, slide_info, presentation_context, language="ko", use_cache=None) -> Slide:
+        await asyncio.sleep(0.01 * (presentation_context["total_slides"] - slide_index))
+        return Slide(slide_id=f"s{slide_index + 1}", title=slide_info["title"])
+
+
+async def test_slide_events_are_streamed_in_deck_order():
+    slide_events = [
+        (event.event, event.data["slide_index"])
+        async for event in FakeAgentService().generate_slides_stream("prompt")
+        if event.event in (SSEEventType.SLIDE_START, SSEEventType.SLIDE_CHUNK, SSEEventType.SLIDE_COMPLETE)
+    ]
+
+    total_slides = len(slide_events) // 3
+    assert total_slides == 7
+    assert slide_events == [
+        (event_type, idx)
+        for idx in range(total_slides)
+        for event_type in (SSEEventType.SLIDE_START, SSEEventType.SLIDE_CHUNK, SSEEventType.SLIDE_COMPLETE)
+    ]
+
+
+async def test_run_complete_lists_slides_in_deck_order():
+    events = [event async for event in FakeAgentService().generate_slides_stream("prompt")]
+
+    assert events[-1].event == SSEEventType.RUN_COMPLETE
+    slide_ids = [slide["slide_id"] for slide in events[-1].data["slidespec"]["slides"]]
+    assert slide_ids == [f"s{idx + 1}" for idx in range(len(slide_ids))]
+
+
+class FakeLLM:
+    """LLM stand-in returning queued responses and recording prompts."""
+
+    provider_name = "fake"
+    model = "fake-model"
+
+    def __init__(self, *responses: str):
+        self.responses = list(responses)
+        self.prompts: list[str] = []
+
+    async def generate_json_text(self, prompt: str, system: str | None = None) -> str:
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+OUTLINE_TEXT = orjson.dumps(OUTLINE).decode()
+
+
+async def test_response_cache_is_off_by_default():
+    llm = FakeLLM(OUTLINE_TEXT, OUTLINE_TEXT)
+    agent = AgentService(llm_service=llm)
+
+    await agent.generate_outline("prompt")
+    await agent.generate_outline("prompt")
+
+    assert len(llm.prompts) == 2
+
+
+async def test_response_cache_hit_and_miss():
+    llm = FakeLLM(OUTLINE_TEXT, OUTLINE_TEXT)
+    agent = AgentService(llm_service=llm)
+
+    first = await agent.generate_outline("prompt", use_cache=True)
+    repeat = await agent.generate_outline("prompt", use_cache=True)
+    assert repeat == first
+    assert len(llm.prompts) == 1
+
+    # A different prompt misses
+    await agent.generate_outline("other prompt", use_cache=True)
+    assert len(llm.prompts) == 2
+
+
+async def test_response_cache_follows_setting(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_response_cache", True)
+    llm = FakeLLM(OUTLINE_TEXT)
+    agent = AgentService(llm_service=llm)
+
+    await agent.generate_outline("prompt")
+    await agent.generate_outline("prompt")
+
+    assert len(llm.prompts) == 1
+
+
+async def test_response_cache_skips_unparsable_output():
+    llm = FakeLLM("not json", OUTLINE_TEXT)
+    agent = AgentService(llm_service=llm)
+
+    with pytest.raises(ValueError):
+        await agent.generate_outline("prompt", use_cache=True)
+    assert await agent.generate_outline("prompt", use_cache=True) == OUTLINE
+    assert len(llm.prompts) == 2
+
+
+SLIDE_TEXT = '{"slide_id": "s1", "type": "content", "title": "Fixed", "elements": []}'
+SLIDE_INFO = {"type": "content", "title": "Intro", "key_points": ["a"]}
+CONTEXT = {"title": "Deck", "total_slides": 1}
+
+
+@pytest.mark.parametrize("invalid", ['["not", "an", "object"]', '"just a string"', '{"type": "bogus"}', "not json"])
+async def test_single_slide_invalid_output_is_repaired(invalid):
+    llm = FakeLLM(invalid, SLIDE_TEXT)
+    agent = AgentService(llm_service=llm)
+
+    slide = await agent.generate_single_slide(0, SLIDE_INFO, CONTEXT, "en")
+
+    assert slide.title == "Fixed"
+    assert slide.slide_id == "s1"
+    assert len(llm.prompts) == 2
+    # The repair request quotes the invalid output back to the model
+    assert invalid in llm.prompts[1]
+
+
+async def test_single_slide_gives_up_after_repair_attempts():
+    llm = FakeLLM(*["[]"] * (SLIDE_REPAIR_ATTEMPTS + 1))
+    agent = AgentService(llm_service=llm)
+
+    with pytest.raises(ValueError):
+        await agent.generate_single_slide(0, SLIDE_INFO, CONTEXT, "en")
+    assert len(llm.prompts) == SLIDE_REPAIR_ATTEMPTS + 1
@@ -0,0 +1,139 @@
+"""Route-level tests for the artifacts API."""
+
+import orjson
+import pytest
+
+from app.api import artifacts
+from tests.conftest import make_slidespec
+
+
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    """Module-level caches are keyed by (artifact_id, version), which repeat across tests."""
+    for cache in (artifacts._deck_html_cache, artifacts._gzip_html_cache, artifacts._response_cache):
+        cache.clear()
+    artifacts._download_tokens.clear()
+
+
+def test_patch_slide_merges_into_stored_slide(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+
+    response = client.patch("/api/v1/artifacts/a1/slides/1", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    slide = storage.get_slidespec("a1")["slides"][1]
+    assert slide["title"] == "Renamed"
+    assert slide["slide_id"] == "s2"
+    # Fields the patch leaves out keep their stored values
+    assert [element["element_id"] for element in slide["elements"]] == ["e1"]
+    assert slide["elements"][0]["content"] == {"text": "Hello"}
+
+
+def test_patch_slide_stores_normalized_slide(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+
+    response = client.patch("/api/v1/artifacts/a1/slides/1", json={"style": {"background": "bg-slate-50"}})
+
+    assert response.status_code == 200
+    slide = storage.get_slidespec("a1")["slides"][1]
+    # Model defaults are filled in, as for a full update
+    assert slide["style"]["background"] == "bg-slate-50"
+    assert slide["style"]["color_scheme"] == "default"
+    assert slide["type"] == "content"
+
+
+def test_patch_slide_rejects_invalid_merge(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+
+    assert client.patch("/api/v1/artifacts/a1/slides/1", json={"type": "bogus"}).status_code == 400
+    assert client.patch("/api/v1/artifacts/a1/slides/1", json=["not", "an", "object"]).status_code == 400
+    assert storage.get_slidespec("a1")["slides"][1] == make_slidespec()["slides"][1]
+
+
+def test_put_slide_replaces_whole_slide(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+
+    response = client.put("/api/v1/artifacts/a1/slides/1", json={"slide_id": "s2", "title": "Replaced"})
+
+    assert response.status_code == 200
+    slide = storage.get_slidespec("a1")["slides"][1]
+    assert slide["title"] == "Replaced"
+    assert slide["elements"] == []
+
+
+def _download_token(client, storage, tmp_path, monkeypatch) -> str:
+    """Run export-stream against a pre-seeded export cache and return its download token."""
+    monkeypatch.setattr(artifacts, "_default_export_cache_dir", tmp_path / "exports")
+    version = storage.get_slidespec_version("a1")
+    cache_path = tmp_path / "exports" / f"a1-{version}.pptx"
+    cache_path.parent.mkdir()
+    cache_path.write_bytes(b"pptx bytes")
+
+    response = client.get("/api/v1/artifacts/a1/export-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame.startswith("event: complete")]
+    assert len(frames) == 1
+    return orjson.loads(frames[0].split("data: ", 1)[1])["download_token"]
+
+
+def test_download_token_is_single_use(client, storage, tmp_path, monkeypatch):
+    storage.save_slidespec("a1", make_slidespec())
+    token = _download_token(client, storage, tmp_path, monkeypatch)
+
+    first = client.get(f"/api/v1/artifacts/a1/download-token/{token}")
+    assert first.status_code == 200
+    assert first.content == b"pptx bytes"
+    assert client.get(f"/api/v1/artifacts/a1/download-token/{token}").status_code == 404
+
+
+def test_download_token_is_bound_to_its_artifact(client, storage, tmp_path, monkeypatch):
+    storage.save_slidespec("a1", make_slidespec())
+    storage.save_slidespec("a2", make_slidespec())
+    token = _download_token(client, storage, tmp_path, monkeypatch)
+
+    assert client.get(f"/api/v1/artifacts/a2/download-token/{token}").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["slidespec", "slides", "slides/1", "preview"])
+def test_matching_if_none_match_returns_304(client, storage, path):
+    storage.save_slidespec("a1", make_slidespec())
+
+    response = client.get(f"/api/v1/artifacts/a1/{path}")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+
+    revalidated = client.get(f"/api/v1/artifacts/a1/{path}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert client.get(f"/api/v1/artifacts/a1/{path}", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_preview_gzip_has_its_own_etag(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+
+    plain = client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.text == plain.text
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+
+
+def test_slide_update_invalidates_cached_responses(client, storage):
+    storage.save_slidespec("a1", make_slidespec())
+    slides = client.get("/api/v1/artifacts/a1/slides")
+    preview = client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "identity"})
+    preview_gz = client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "gzip"})
+    assert "Renamed" not in preview.text
+
+    title = {"element_id": "e1", "kind": "text", "role": "title", "content": {"text": "Renamed"}}
+    assert client.patch("/api/v1/artifacts/a1/slides/1", json={"elements": [title]}).status_code == 200
+
+    # Old ETags no longer revalidate, and every cached representation is rebuilt
+    for response, encoding in [(slides, "identity"), (preview, "identity"), (preview_gz, "gzip")]:
+        path = response.url.path
+        fresh = client.get(path, headers={"If-None-Match": response.headers["etag"], "Accept-Encoding": encoding})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != response.headers["etag"]
+    assert client.get("/api/v1/artifacts/a1/slides").json()["slides"][1]["title"] == "Renamed"
+    assert "Renamed" in client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "identity"}).text
+    assert "Renamed" in client.get("/api/v1/artifacts/a1/preview", headers={"Accept-Encoding": "gzip"}).text
@@ -0,0 +1,31 @@
+"""Tests for the LLM request rate limiter."""
+
+import asyncio
+import time
+
+from app.services.llm_service import TokenBucket
+
+
+async def _acquire_many(bucket: TokenBucket, count: int) -> None:
+    await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+
+
+async def test_token_bucket_spaces_out_requests_beyond_the_burst():
+    bucket = TokenBucket(rate=2, period=0.2)
+
+    start = time.monotonic()
+    await _acquire_many(bucket, 2)
+    assert time.monotonic() - start < 0.05
+
+    await _acquire_many(bucket, 2)
+    # Two more tokens refill at 10 per second
+    assert time.monotonic() - start >= 0.15
+
+
+def test_token_bucket_is_usable_from_several_event_loops():
+    bucket = TokenBucket(rate=1, period=0.02)
+
+    # Contention makes each loop wait on the lock; a lock bound to the first
+    # loop would raise RuntimeError in the second
+    asyncio.run(_acquire_many(bucket, 3))
+    asyncio.run(_acquire_many(bucket, 3))
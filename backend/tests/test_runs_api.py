@@ -0,0 +1,65 @@
+"""Route-level tests for the runs API."""
+
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+
+from app.schemas.run import DocumentType, RunState, RunStatus
+
+
+@pytest.fixture
+def legacy_run(tmp_path) -> str:
+    """A run file as written by older versions (ISO strings, no progress), on disk before storage loads."""
+    run_id = "r-old"
+    runs_dir = tmp_path / "data" / "runs"
+    runs_dir.mkdir(parents=True)
+    run = {
+        "run_id": run_id,
+        "status": "completed",
+        "document_type": "slides",
+        "created_at": "2026-01-02T03:04:05+00:00",
+        "updated_at": "2026-01-02T03:05:00+00:00",
+        "artifact_id": run_id,
+    }
+    (runs_dir / f"{run_id}.json").write_bytes(orjson.dumps(run))
+    return run_id
+
+
+def test_list_runs_normalizes_stored_runs(legacy_run, client, storage):
+    now = datetime(2026, 1, 2, 4, 0, tzinfo=timezone.utc)
+    storage.save_run("r-new", RunState(
+        run_id="r-new",
+        status=RunStatus.GENERATING,
+        document_type=DocumentType.SLIDES,
+        created_at=now,
+        updated_at=now,
+        progress=40.0,
+    ))
+
+    response = client.get("/api/v1/runs")
+
+    assert response.status_code == 200
+    items = {item["run_id"]: item for item in response.json()["items"]}
+    assert items[legacy_run]["progress"] == 0.0
+    assert items[legacy_run]["created_at"] == "2026-01-02T03:04:05+00:00"
+    assert items["r-new"]["created_at"] == "2026-01-02T04:00:00+00:00"
+    assert items["r-new"]["status"] == "generating"
+    assert set(items[legacy_run]) == set(items["r-new"])
+    assert response.json()["total"] == 2
+
+
+def test_run_state_from_dict_converts_stored_strings():
+    state = RunState.from_dict({
+        "run_id": "r1",
+        "status": "failed",
+        "document_type": "slides",
+        "created_at": "2026-01-02T03:04:05+00:00",
+        "updated_at": "2026-01-02T03:04:05+00:00",
+        "unknown": "ignored",
+    })
+
+    assert state.status is RunStatus.FAILED
+    assert state.document_type is DocumentType.SLIDES
+    assert state.created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert state.progress == 0.0
@@ -0,0 +1,8 @@
+"""Smoke tests: the application must import and build."""
+
+import importlib
+
+
+def test_app_main_imports():
+    main = importlib.import_module("app.main")
+    assert main.app is not None
@@ -0,0 +1,117 @@
+"""Tests for StorageService's write-behind slidespec persistence."""
+
+import asyncio
+import copy
+import threading
+
+import orjson
+import pytest
+
+from app.services import storage_service
+from app.services.storage_service import StorageService
+from tests.conftest import make_slidespec
+
+
+def _stored_title(storage: StorageService, artifact_id: str) -> str:
+    path = storage.slidespecs_dir / f"{artifact_id}.json"
+    return orjson.loads(path.read_bytes())["deck"]["title"]
+
+
+def _edited(slidespec: dict, title: str) -> dict:
+    edited = copy.deepcopy(slidespec)
+    edited["deck"]["title"] = title
+    return edited
+
+
+@pytest.fixture
+def paused_writes(storage, monkeypatch):
+    """Hold background slidespec writes until `release` is set.
+
+    `started` is set once a write is in flight on its worker thread.
+    """
+    started, release = threading.Event(), threading.Event()
+    write = storage._write_slidespec_file
+
+    def paused_write(*args):
+        started.set()
+        release.wait(5)
+        write(*args)
+
+    monkeypatch.setattr(storage, "_write_slidespec_file", paused_write)
+    return started, release
+
+
+async def _wait_for(event: threading.Event) -> None:
+    while not event.is_set():
+        await asyncio.sleep(0.001)
+
+
+async def test_flush_writes_latest_deferred_save(storage):
+    storage.save_slidespec_deferred("a1", make_slidespec("v1"))
+    storage.save_slidespec_deferred("a1", make_slidespec("v2"))
+    storage.save_slidespec_deferred("a2", make_slidespec("other"))
+
+    await storage.flush_slidespecs()
+
+    assert _stored_title(storage, "a1") == "v2"
+    assert _stored_title(storage, "a2") == "other"
+    assert not storage._dirty_slidespecs
+
+
+async def test_save_during_flush_skips_stale_write_and_stays_dirty(storage, paused_writes):
+    started, release = paused_writes
+    storage.save_slidespec_deferred("a1", make_slidespec("v1"))
+
+    flush = asyncio.create_task(storage.flush_slidespecs())
+    await _wait_for(started)
+    storage.save_slidespec_deferred("a1", make_slidespec("v2"))
+    release.set()
+    await flush
+
+    # The in-flight write was superseded, so it was skipped and a1 stays queued
+    assert not (storage.slidespecs_dir / "a1.json").exists()
+    assert "a1" in storage._dirty_slidespecs
+
+    await storage.flush_slidespecs()
+    assert _stored_title(storage, "a1") == "v2"
+    assert "a1" not in storage._dirty_slidespecs
+
+
+async def test_delete_during_flush_is_not_undone(storage, paused_writes):
+    started, release = paused_writes
+    storage.save_slidespec("a1", make_slidespec("v1"))
+    storage.save_slidespec_deferred("a1", _edited(storage.get_slidespec("a1"), "v2"))
+
+    flush = asyncio.create_task(storage.flush_slidespecs())
+    await _wait_for(started)
+    assert storage.delete_slidespec("a1")
+    release.set()
+    await flush
+
+    assert not (storage.slidespecs_dir / "a1.json").exists()
+    assert storage.get_slidespec("a1") is None
+    # Still gone after a restart
+    assert StorageService(storage_dir=str(storage.storage_dir)).get_slidespec("a1") is None
+
+
+async def test_delete_waits_for_write_past_its_version_check(storage, monkeypatch):
+    """A write that already passed its version check can't recreate a deleted file."""
+    writing, release = threading.Event(), threading.Event()
+
+    def paused_open(path, mode="r", *args, **kwargs):
+        if mode == "wb" and threading.current_thread() is not threading.main_thread():
+            writing.set()
+            release.wait(5)
+        return open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(storage_service, "open", paused_open, raising=False)
+    storage.save_slidespec_deferred("a1", make_slidespec("v1"))
+
+    flush = asyncio.create_task(storage.flush_slidespecs())
+    await _wait_for(writing)
+    # delete blocks on the write lock until the in-flight write is done
+    threading.Timer(0.05, release.set).start()
+    assert storage.delete_slidespec("a1")
+    await flush
+
+    assert not (storage.slidespecs_dir / "a1.json").exists()